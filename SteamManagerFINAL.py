@@ -1,33 +1,1978 @@
 import customtkinter as ctk
 import os
 import re
+import struct
 import configparser
 from tkinter import filedialog, messagebox
 import shutil
-import webbrowser
-from datetime import datetime
-import csv
-import json
-import requests  # For API calls
+import importlib
+from datetime import datetime, timedelta
+import bisect
+import difflib
+import heapq
+import hashlib
+from collections import OrderedDict
 from io import BytesIO
-from PIL import Image, ImageDraw
 import time
 import subprocess
+import signal
 import sys
+import tempfile
+import contextlib
 import threading
-import pystray  # For system tray icon
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
-# Windows-specific imports for icon extraction and registry access.
+from launcher import claim_instance
+
+
+class LazyModule:
+    # Stands in for a module that only some features need: the real import happens on first
+    # attribute access (from any thread; the import system serializes it), keeping startup short.
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+requests = LazyModule("requests")  # For API calls
+json = LazyModule("json")
+csv = LazyModule("csv")
+webbrowser = LazyModule("webbrowser")
+Image = LazyModule("PIL.Image")
+ImageDraw = LazyModule("PIL.ImageDraw")
+pystray = LazyModule("pystray")  # For system tray icon
+
+# Windows-specific modules for icon extraction, drive types and process control.
 if os.name == "nt":
-    import win32ui
-    import win32gui
-    import win32con
+    win32ui = LazyModule("win32ui")
+    win32gui = LazyModule("win32gui")
+    win32con = LazyModule("win32con")
+    win32file = LazyModule("win32file")
+    win32api = LazyModule("win32api")
+    win32process = LazyModule("win32process")
     import winreg  # For Run on Startup
 
-LIBRARY_FILE = "library.json"  # File to persist library items
+LIBRARY_FILE = "library.json"  # File to persist library items
+LIBRARY_SAVE_DELAY_MS = 1500   # Window over which library changes are coalesced into one write
+SCAN_BATCH_SIZE = 25           # Resolved items handed to the UI per batch during a folder scan
+SCAN_BATCH_INTERVAL = 0.5      # ...or sooner, once this many seconds have passed since the last batch
+SCAN_POLL_MS = 100             # How often the Tk thread drains scan results
+TASK_WORKERS = 8               # Threads shared by background work started from the UI
+TASK_POLL_MS = 50              # How often the Tk thread runs callbacks of finished tasks
+CSV_CHUNK_SIZE = 1000          # Rows per chunk handed between the CSV worker and the UI
+CSV_QUEUE_CHUNKS = 4           # Chunks buffered ahead of the UI, so imports use flat memory
+CSV_MERGE_BUDGET = 0.05        # Seconds of merging per Tk tick before yielding to pending events
+RESOLVE_CACHE_FILE = "resolve_cache.json"  # Cleaned exe name -> matched app (or null for "no match")
+RESOLVE_WORKERS = 8            # Concurrent exe -> game lookups during a scan
+SCAN_WALKERS = 4               # Top-level subdirectories walked in parallel during a scan
+HEALTH_CACHE_FILE = "health_cache.json"  # Library path -> [status, checked at] from the last health check
+HEALTH_LOCAL_WORKERS = 4       # Concurrent stats per local drive (seek-bound on HDDs)
+HEALTH_NETWORK_WORKERS = 16    # Concurrent stats per network share (latency-bound)
+SIZE_CACHE_FILE = "size_cache.json"  # Game folder / app manifest path -> [mtime_ns, size in bytes]
+SIZE_WORKERS = 4               # Top-level subdirectories of a game folder sized in parallel
+SIZE_RESORT_DELAY_MS = 500     # Views sorted by size re-sort at most this often while sizes arrive
+APP_DETAILS_FILE = "appdetails_cache.json"  # AppID -> [fetched at, store details], kept across runs
+# The appdetails fields the UI reads; the rest of the (large) store response is not kept.
+APP_DETAILS_FIELDS = ("name", "short_description", "header_image", "release_date", "developers",
+                      "publishers", "genres", "metacritic")
+PREFETCH_INTERVAL = 1.5        # Seconds between background appdetails requests (the store API rate-limits)
+PREFETCH_IDLE_SECONDS = 3      # Prefetch only after this long without input, or while hidden in the tray
+STEAM_POLL_SECONDS = 2         # How often the Steam supervisor checks whether Steam is running
+STEAM_SCAN_SECONDS = 30        # How often it searches the whole process list for a Steam started elsewhere
+STEAM_HELPER_SECONDS = 1       # How long DeleteSteamAppCache.exe gets after Steam is launched
+STEAM_STOP_TIMEOUT = 10        # Seconds Steam gets to exit after it is terminated
+IDLE_JOB_BUDGET = 2            # Seconds of work a maintenance job gets per turn while hidden in the tray
+IDLE_JOB_PAUSE = 5             # Seconds of rest between maintenance turns, and the first retry delay
+IDLE_JOB_INTERVAL = 3600       # Seconds before a job that has caught up runs again
+IDLE_BACKOFF_MAX = 3600        # Cap on the retry delay of a job that keeps failing
+APP_LIST_MAX_AGE = 7 * 86400   # App list snapshots older than this are re-downloaded while idle
+APP_LIST_FETCH_BUDGET = 60     # Seconds the idle app list download may take before it is retried later
+APP_DETAILS_MAX_AGE = 7 * 86400  # Cached store details older than this are re-fetched while idle
+HEALTH_MAX_AGE = 86400         # Library paths last checked longer ago than this are re-checked while idle
+SCAN_STATE_DIR = "scan_state"  # Folder scan checkpoints, one JSON file per scanned folder
+SCAN_CHECKPOINT_INTERVAL = 10  # Seconds between checkpoints of a running scan
+SCAN_CHECKPOINT_VERSION = 1    # Bump when the checkpoint layout changes
+APP_LIST_FILE = "applist_cache.json"  # Snapshot of the Steam app list, reused for search and offline matching
+OFFLINE_MATCH_THRESHOLD = 0.8  # Offline matches scoring below this fall back to the SearchApps lookup
+ICON_CACHE_DIR = "icon_cache"  # Extracted executable icons, stored as PNG
+ICON_CACHE_SIZE = 512          # Icons kept in memory (LRU)
+ICON_CACHE_VERSION = 2         # Bump when extraction changes so stale PNGs are not reused
+SEARCH_RESULT_LIMIT = 200      # Search matches listed; rows are virtualized, so only visible ones load images
+MIN_GAME_EXE_SIZE = 48 * 1024  # Smaller executables are treated as stubs/helpers by the scan pre-filter
+
+# File names of redistributables, installers, crash handlers and helper processes shipped next to games.
+NON_GAME_EXE_PATTERN = re.compile(
+    r"^(unins\d*|.*vc_?redist.*|dxsetup|dxwebsetup|dotnetfx.*|ndp\d+.*|oalinst|physx.*|.*redist.*"
+    r"|.*setup.*|.*install.*|.*uninst.*|.*updater|.*prereq.*|.*crash(handler|report|reporter|pad|sender|_handler).*"
+    r"|crashreportclient|easyanticheat.*|beservice.*|battleye.*|cefsharp\..*|.*webhelper|qtwebengineprocess"
+    r"|.*subprocess|.*helper|touchup|cleanup)\.exe$",
+    re.IGNORECASE,
+)
+# Lower-case fragments of ProductName/FileDescription that mark an executable as not a game.
+NON_GAME_VERSION_KEYWORDS = (
+    "redistributable", "installer", "setup", "uninstall", "crash handler", "crash report", "crashpad",
+    "directx", "visual c++", ".net framework", "anti-cheat", "anticheat", "battleye", "updater",
+    "bug report", "prerequisite", "web helper", "webhelper",
+)
+
+# Directory names (lower-case) a folder scan never descends into: redistributables, installers,
+# VCS/tooling folders and shader caches, which can hold thousands of files and no games.
+PRUNED_SCAN_DIRS = frozenset((
+    "_commonredist", "commonredist", "__installer", "redist", "vcredist", "directx",
+    ".git", ".svn", ".hg", "node_modules", "__pycache__",
+    "shadercache", "shader_cache", "shadercache_vulkan", "dxcache", "glcache", "nv_cache",
+    "$recycle.bin", "system volume information",
+))
+
+# Folder names (lower-case) between a game's install folder and its executable.
+INSTALL_SUBDIRS = frozenset((
+    "bin", "bin32", "bin64", "binaries", "win32", "win64", "x86", "x64", "windows", "retail", "shipping",
+))
+
+# Accepted values of a fav: query clause; with any other value the word is searched as plain text.
+FAVORITE_QUERY_VALUES = {
+    "yes": True, "y": True, "true": True, "1": True, "on": True,
+    "no": False, "n": False, "false": False, "0": False, "off": False,
+}
+
+
+def library_path_key(path):
+    # Windows paths are case-insensitive and accept both separators, so normalize before hashing.
+    return os.path.normcase(os.path.normpath(path))
+
+
+DATE_EPOCH = datetime(1970, 1, 1)
+
+
+def date_added_now():
+    return (datetime.now() - DATE_EPOCH) // timedelta(microseconds=1)
+
+
+def parse_date_added(text):
+    # ISO string from library.json / CSV -> microseconds since DATE_EPOCH (naive local time, as
+    # datetime.now() wrote it). 0 means unknown.
+    try:
+        value = datetime.fromisoformat(text.strip()).replace(tzinfo=None)
+    except (ValueError, AttributeError):
+        return 0
+    return (value - DATE_EPOCH) // timedelta(microseconds=1)
+
+
+def format_date_added(value):
+    # Inverse of parse_date_added; isoformat() gives back the exact string datetime.now() produced.
+    return (DATE_EPOCH + timedelta(microseconds=value)).isoformat() if value else ""
+
+
+def date_prefix_range(prefix):
+    # '2024', '2024-01' or '2024-01-15' -> [start, end) in date_added units, or None.
+    match = re.match(r"^(\d{4})(?:-(\d{1,2})(?:-(\d{1,2}))?)?$", prefix)
+    if not match:
+        return None
+    year, month, day = (int(part) if part else None for part in match.groups())
+    try:
+        start = datetime(year, month or 1, day or 1)
+        if day:
+            end = start + timedelta(days=1)
+        elif month:
+            end = datetime(year + month // 12, month % 12 + 1, 1)
+        else:
+            end = datetime(year + 1, 1, 1)
+    except ValueError:
+        return None
+    unit = timedelta(microseconds=1)
+    return (start - DATE_EPOCH) // unit, (end - DATE_EPOCH) // unit
+
+
+# Read once at import: the only way to read the umask is to set it, which is not thread-safe.
+FILE_UMASK = os.umask(0)
+os.umask(FILE_UMASK)
+
+
+@contextlib.contextmanager
+def atomic_write(path, suffix="", newline=None):
+    # Write to a temp file in the same directory, then swap it in so a crash or a cancelled
+    # export never leaves a truncated file.
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=suffix, dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline=newline) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except OSError:
+            mode = 0o666 & ~FILE_UMASK  # What a plain open() would have created
+        os.chmod(tmp_path, mode)  # mkstemp creates the file owner-only
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class LibraryItem:
+    # One library entry. Slots instead of a dict per item, and date_added as an int (see
+    # parse_date_added) so it sorts and compares without string handling. library.json and the
+    # CSV export keep the ISO string form.
+    __slots__ = ("path", "name", "favorite", "date_added")
+
+    def __init__(self, path, name="", favorite=False, date_added=None):
+        self.path = path
+        self.name = name
+        self.favorite = favorite
+        self.date_added = date_added_now() if date_added is None else date_added
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["path"], data.get("name", ""), bool(data.get("favorite", False)),
+                   parse_date_added(data.get("date_added", "")))
+
+    def to_dict(self):
+        return {"path": self.path, "name": self.name, "favorite": self.favorite,
+                "date_added": format_date_added(self.date_added)}
+
+
+def query_tokens(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def library_drive(path):
+    match = re.match(r"^([A-Za-z]):", path)
+    return match.group(1).upper() if match else ""
+
+
+def parse_library_query(text):
+    # 'fav:yes drive:D witcher added:>2024-01' -> [(field, op, value, negate), ...].
+    # Fields: fav:yes|no, drive:<letter>, added:[>|>=|<|<=]<date prefix> or added:<from>..<to>,
+    # name:<text>, path:<text>; anything else is free text over name and path, matching word
+    # prefixes. A leading "-" negates a clause and double quotes group words ('path:"steam library"').
+    clauses = []
+    for word in re.findall(r'(?:[^\s"]+|"[^"]*")+', text):
+        word = word.replace('"', " ")
+        negate = word.startswith("-") and len(word) > 1
+        if negate:
+            word = word[1:]
+        field, sep, value = word.partition(":")
+        field = field.lower()
+        value = value.strip()
+        if sep and field == "fav" and value.lower() in FAVORITE_QUERY_VALUES:
+            clauses.append(("fav", "=", FAVORITE_QUERY_VALUES[value.lower()], negate))
+        elif sep and value and field == "drive":
+            clauses.append(("drive", "=", value.rstrip(":\\/").upper(), negate))
+        elif sep and value and field == "added":
+            op, value = re.match(r"^(>=|<=|>|<|=)?(.*)$", value).groups()
+            if ".." in value:
+                clauses.append(("added", "..", tuple(value.split("..", 1)), negate))
+            else:
+                clauses.append(("added", op or "=", value, negate))
+        elif sep and value and field in ("name", "path"):
+            clauses.extend((field, "~", token, negate) for token in query_tokens(value))
+        else:
+            clauses.extend(("text", "~", token, negate) for token in query_tokens(word))
+    return clauses
+
+
+class LibraryIndex:
+    # Library items kept in insertion order behind a path-keyed dict: duplicate checks,
+    # lookups and removals are O(1) instead of a scan over the whole list. Lower-cased names
+    # and the name / date_added orderings are maintained on insert and remove, so the view
+    # never re-sorts or re-normalizes the whole library. Inverted token indexes over the name
+    # and the path components, plus a per-drive index, back query().
+    def __init__(self, items=()):
+        self._items = {}
+        self._search = {}   # key -> lower-cased name
+        self._by_name = []  # sorted (lower-cased name, key)
+        self._by_date = []  # sorted (date_added, key); iterated backwards for newest first
+        self._name_tokens = {}  # token -> keys whose name contains it
+        self._path_tokens = {}  # token -> keys whose path contains it
+        self._vocabulary = []   # sorted tokens of both indexes, for prefix lookups
+        self._by_drive = {}     # drive letter -> keys
+        self.version = 0    # Bumped on every insert/remove, for callers caching derived results
+        self.favorites_version = 0  # Bumped on every favorite change, which only fav: queries depend on
+        for item in items:
+            self._add(item, bulk=True)
+        self._by_name.sort()
+        self._by_date.sort()
+        self._vocabulary.sort()
+
+    def _add(self, item, bulk=False):
+        key = library_path_key(item.path)
+        if key in self._items:
+            return False
+        self._items[key] = item
+        name = item.name.lower()
+        self._search[key] = name
+        if bulk:
+            self._by_name.append((name, key))
+            self._by_date.append((item.date_added, key))
+        else:
+            bisect.insort(self._by_name, (name, key))
+            bisect.insort(self._by_date, (item.date_added, key))
+        for postings, tokens in ((self._name_tokens, query_tokens(name)), (self._path_tokens, query_tokens(item.path))):
+            for token in tokens:
+                if token not in self._name_tokens and token not in self._path_tokens:
+                    if bulk:
+                        self._vocabulary.append(token)
+                    else:
+                        bisect.insort(self._vocabulary, token)
+                postings.setdefault(token, set()).add(key)
+        self._by_drive.setdefault(library_drive(item.path), set()).add(key)
+        self.version += 1
+        return True
+
+    def add(self, item):
+        return self._add(item)
+
+    def add_many(self, items):
+        # For large merges: append, then re-sort once (the orderings stay mostly sorted, which
+        # timsort handles in near-linear time) instead of an insort per item.
+        added = [item for item in items if self._add(item, bulk=True)]
+        if added:
+            self._by_name.sort()
+            self._by_date.sort()
+            self._vocabulary.sort()
+        return added
+
+    def get(self, path):
+        return self._items.get(library_path_key(path))
+
+    def remove(self, path):
+        key = library_path_key(path)
+        item = self._items.pop(key, None)
+        if item is None:
+            return None
+        name = self._search.pop(key)
+        for ordering, sort_key in ((self._by_name, name), (self._by_date, item.date_added)):
+            index = bisect.bisect_left(ordering, (sort_key, key))
+            if index < len(ordering) and ordering[index] == (sort_key, key):
+                del ordering[index]
+        for postings, tokens in ((self._name_tokens, query_tokens(name)),
+                                 (self._path_tokens, query_tokens(item.path)),
+                                 (self._by_drive, [library_drive(item.path)])):
+            for token in tokens:
+                keys = postings.get(token)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del postings[token]
+                        if postings is not self._by_drive and token not in self._name_tokens and token not in self._path_tokens:
+                            del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+        self.version += 1
+        return item
+
+    def set_favorite(self, path, favorite):
+        item = self.get(path)
+        if item is not None:
+            item.favorite = favorite
+            self.favorites_version += 1
+        return item
+
+    def ordered(self, method="name"):
+        # (key, item) pairs by name A-Z, or by date_added newest first.
+        if method == "date":
+            return [(key, self._items[key]) for _, key in reversed(self._by_date)]
+        return [(key, self._items[key]) for _, key in self._by_name]
+
+    def query(self, text):
+        # Keys matching a parse_library_query() string, or None when it has no clauses.
+        # Clauses are ANDed; negated ones are subtracted at the end.
+        clauses = parse_library_query(text)
+        if not clauses:
+            return None
+        result = None
+        excluded = set()
+        # Favorites aren't indexed (they change too often), so they filter what the rest left.
+        for field, op, value, negate in sorted(clauses, key=lambda clause: clause[0] == "fav"):
+            if field == "fav":
+                candidates = self._items if result is None else result
+                keys = {key for key in candidates if self._items[key].favorite == value}
+                if negate:
+                    keys = set(candidates) - keys
+                result = keys
+            elif negate:
+                excluded |= self._clause_keys(field, op, value)
+            else:
+                keys = self._clause_keys(field, op, value)
+                result = keys if result is None else result & keys
+            if result is not None and not result:
+                return set()
+        if result is None:
+            result = set(self._items)
+        return result - excluded
+
+    def _clause_keys(self, field, op, value):
+        if field == "drive":
+            return set(self._by_drive.get(value, ()))
+        if field == "added":
+            return self._date_keys(op, value)
+        postings = [self._name_tokens, self._path_tokens]
+        if field == "name":
+            postings = [self._name_tokens]
+        elif field == "path":
+            postings = [self._path_tokens]
+        # Terms match token prefixes ("witch" finds "witcher3"): a bisect into the sorted
+        # vocabulary instead of a scan over every item or every token.
+        keys = set()
+        start = bisect.bisect_left(self._vocabulary, value)
+        end = bisect.bisect_left(self._vocabulary, value + "\uffff", start)
+        for token in self._vocabulary[start:end]:
+            for index in postings:
+                keys.update(index.get(token, ()))
+        return keys
+
+    def _date_keys(self, op, value):
+        # A date prefix covers a [start, end) range, i.e. a contiguous run of _by_date.
+        dates = self._by_date
+        ranges = [date_prefix_range(part) for part in (value if op == ".." else (value,))]
+        if None in ranges:
+            return set()
+        low, high = ranges[0][0], ranges[-1][1]
+        if op == ">":
+            low, high = high, None
+        elif op == ">=":
+            high = None
+        elif op == "<":
+            low, high = None, low
+        elif op == "<=":
+            low = None
+        start = 0 if low is None else bisect.bisect_left(dates, (low,))
+        end = len(dates) if high is None else bisect.bisect_left(dates, (high,))
+        return {key for _, key in dates[start:end]}
+
+    def to_list(self):
+        return [item.to_dict() for item in self._items.values()]
+
+    def __contains__(self, path):
+        return library_path_key(path) in self._items
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def __len__(self):
+        return len(self._items)
+
+
+class IconCache:
+    # Executable icons kept in an in-memory LRU and as PNGs on disk, keyed by path + mtime + size
+    # so a changed executable gets a fresh icon. get() never extracts: misses are queued for a
+    # worker thread, which checks the disk cache, falls back to `extract`, and then calls
+    # `on_ready(path)` from the worker thread.
+    def __init__(self, extract, on_ready=None, directory=ICON_CACHE_DIR, capacity=ICON_CACHE_SIZE):
+        self.extract = extract
+        self.on_ready = on_ready
+        self.directory = directory
+        self.capacity = capacity
+        self._memory = OrderedDict()  # key -> PIL image, or False when the executable has no icon
+        self._queued = set()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def key(self, path):
+        st = os.stat(path)
+        signature = f"{ICON_CACHE_VERSION}|{library_path_key(path)}|{st.st_mtime_ns}|{st.st_size}"
+        return hashlib.sha1(signature.encode("utf-8")).hexdigest()
+
+    def get(self, path):
+        # The cached icon, or None if there is none (yet).
+        try:
+            key = self.key(path)
+        except OSError:
+            return None
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                return image or None
+            if key in self._queued:
+                return None
+            self._queued.add(key)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+        self._queue.put((path, key))
+        return None
+
+    def warm(self, path):
+        # Extracts into the disk cache on the calling thread, leaving the in-memory LRU alone.
+        try:
+            key = self.key(path)
+        except OSError:
+            return
+        with self._lock:
+            if key in self._memory or key in self._queued:
+                return
+        if any(os.path.exists(os.path.join(self.directory, key + ext)) for ext in (".png", ".none")):
+            return
+        self._store(key, self.extract(path) or False)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _run(self):
+        while True:
+            path, key = self._queue.get()
+            image = self._load(key)
+            if image is None:
+                image = self.extract(path) or False
+                self._store(key, image)
+            with self._lock:
+                self._memory[key] = image
+                self._queued.discard(key)
+                while len(self._memory) > self.capacity:
+                    self._memory.popitem(last=False)
+            if self.on_ready:
+                self.on_ready(path)
+
+    def _load(self, key):
+        png_path = os.path.join(self.directory, f"{key}.png")
+        try:
+            if os.path.exists(os.path.join(self.directory, f"{key}.none")):
+                return False
+            with Image.open(png_path) as img:
+                return img.copy()
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, key, image):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if image is False:
+                open(os.path.join(self.directory, f"{key}.none"), "wb").close()
+                return
+            png_path = os.path.join(self.directory, f"{key}.png")
+            image.save(png_path + ".tmp", "PNG")
+            os.replace(png_path + ".tmp", png_path)
+        except OSError:
+            pass
+
+
+class PEError(Exception):
+    pass
+
+
+class PEFile:
+    # Just enough of the PE/COFF format for the scan pre-filter: the headers, the section table
+    # and the resource tree. Only the header page and the resource section are read from disk.
+    RT_ICON = 3
+    RT_GROUP_ICON = 14
+    RT_VERSION = 16
+    SUBSYSTEM_WINDOWS_GUI = 2
+    SUBSYSTEM_WINDOWS_CUI = 3
+
+    def __init__(self, path):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self._rsrc = None
+        with open(path, "rb") as f:
+            dos = f.read(64)
+            if len(dos) < 64 or dos[:2] != b"MZ":
+                raise PEError("not an MZ executable")
+            f.seek(struct.unpack_from("<I", dos, 0x3C)[0])
+            nt = f.read(4096)
+        if nt[:4] != b"PE\0\0":
+            raise PEError("missing PE signature")
+        try:
+            _, num_sections, _, _, _, opt_size, characteristics = struct.unpack_from("<HHIIIHH", nt, 4)
+            opt = 24
+            magic = struct.unpack_from("<H", nt, opt)[0]
+            if magic == 0x10B:
+                dirs = opt + 96
+            elif magic == 0x20B:
+                dirs = opt + 112
+            else:
+                raise PEError(f"unknown optional header magic {magic:#x}")
+            self.subsystem = struct.unpack_from("<H", nt, opt + 68)[0]
+            self.is_dll = bool(characteristics & 0x2000)
+            num_dirs = struct.unpack_from("<I", nt, dirs - 4)[0]
+            self.resource_rva, self.resource_size = struct.unpack_from("<II", nt, dirs + 16) if num_dirs > 2 else (0, 0)
+            self.sections = []
+            for i in range(num_sections):
+                vsize, vaddr, raw_size, raw_ptr = struct.unpack_from("<IIII", nt, opt + opt_size + 40 * i + 8)
+                self.sections.append((vaddr, max(vsize, raw_size), raw_ptr, raw_size))
+        except struct.error:
+            raise PEError("truncated PE headers")
+
+    def _rva_to_offset(self, rva):
+        for vaddr, vsize, raw_ptr, raw_size in self.sections:
+            if vaddr <= rva < vaddr + vsize and rva - vaddr < raw_size:
+                return raw_ptr + rva - vaddr
+        raise PEError(f"RVA {rva:#x} is not backed by file data")
+
+    def _read_rva(self, rva, size):
+        start = rva - self.resource_rva
+        if 0 <= start and start + size <= len(self._rsrc):
+            return self._rsrc[start:start + size]
+        with open(self.path, "rb") as f:
+            f.seek(self._rva_to_offset(rva))
+            return f.read(size)
+
+    def _resource_entries(self, offset):
+        named, ids = struct.unpack_from("<HH", self._rsrc, offset + 12)
+        for i in range(named + ids):
+            name, target = struct.unpack_from("<II", self._rsrc, offset + 16 + 8 * i)
+            if name & 0x80000000:
+                name_offset = name & 0x7FFFFFFF
+                length = struct.unpack_from("<H", self._rsrc, name_offset)[0]
+                key = self._rsrc[name_offset + 2:name_offset + 2 + 2 * length].decode("utf-16-le", "replace")
+            else:
+                key = name
+            yield key, target & 0x7FFFFFFF, bool(target & 0x80000000)
+
+    def resources(self, type_id):
+        # {resource id or name: data} for one resource type, taking the first language of each.
+        if not self.resource_rva:
+            return {}
+        if self._rsrc is None:
+            with open(self.path, "rb") as f:
+                f.seek(self._rva_to_offset(self.resource_rva))
+                self._rsrc = f.read(self.resource_size)
+        result = {}
+        try:
+            for type_key, type_offset, is_dir in self._resource_entries(0):
+                if type_key != type_id or not is_dir:
+                    continue
+                for name_key, name_offset, is_dir in self._resource_entries(type_offset):
+                    if not is_dir:
+                        continue
+                    for _, data_offset, is_dir in self._resource_entries(name_offset):
+                        if not is_dir:
+                            data_rva, size = struct.unpack_from("<II", self._rsrc, data_offset)
+                            result[name_key] = self._read_rva(data_rva, size)
+                            break
+        except struct.error:
+            raise PEError("corrupt resource directory")
+        return result
+
+    @staticmethod
+    def _version_blocks(blob, offset, end):
+        # Children of a VS_VERSIONINFO-style block: (key, value offset, children offset, block end).
+        while offset + 6 <= end:
+            length = struct.unpack_from("<H", blob, offset)[0]
+            if length < 6:
+                break
+            key_end = offset + 6
+            while key_end + 1 < end and blob[key_end:key_end + 2] != b"\0\0":
+                key_end += 2
+            key = blob[offset + 6:key_end].decode("utf-16-le", "replace")
+            value_start = (key_end + 5) & ~3
+            value_length, value_type = struct.unpack_from("<HH", blob, offset + 2)
+            value_size = value_length * 2 if value_type == 1 else value_length
+            block_end = min(offset + length, end)
+            yield key, value_start, (value_start + value_size + 3) & ~3, block_end
+            offset = (block_end + 3) & ~3
+
+    def version_strings(self):
+        # ProductName, FileDescription, ... from the first StringTable of the version resource.
+        strings = {}
+        for blob in self.resources(self.RT_VERSION).values():
+            try:
+                for _, _, children, end in self._version_blocks(blob, 0, len(blob)):
+                    for info_key, _, tables, info_end in self._version_blocks(blob, children, end):
+                        if info_key != "StringFileInfo":
+                            continue
+                        for _, _, entries, table_end in self._version_blocks(blob, tables, info_end):
+                            for name, value_start, _, string_end in self._version_blocks(blob, entries, table_end):
+                                value = blob[value_start:string_end].decode("utf-16-le", "replace")
+                                strings.setdefault(name, value.split("\0", 1)[0].strip())
+                    break
+            except struct.error:
+                pass
+            break
+        return strings
+
+
+def extract_pe_icon(path, size=(120, 68)):
+    # Pure-Python replacement for ExtractIconEx: take the first RT_GROUP_ICON, pick the smallest
+    # entry that covers the target height (else the largest), wrap that RT_ICON in a one-image
+    # .ico and let Pillow decode it. The icon is centred on a transparent canvas of `size`.
+    pe = PEFile(path)
+    groups = pe.resources(PEFile.RT_GROUP_ICON)
+    if not groups:
+        return None
+    group = next(iter(groups.values()))
+    icons = pe.resources(PEFile.RT_ICON)
+    side = min(size)
+    best = None
+    try:
+        count = struct.unpack_from("<H", group, 4)[0]
+        for i in range(count):
+            width, height, colors, _, planes, bits, _, icon_id = struct.unpack_from("<BBBBHHIH", group, 6 + 14 * i)
+            data = icons.get(icon_id)
+            if not data:
+                continue
+            pixels = width or 256
+            rank = (pixels >= side, -pixels if pixels >= side else pixels, bits)
+            if best is None or rank > best[0]:
+                best = (rank, struct.pack("<BBBBHHII", width, height, colors, 0, planes, bits, len(data), 22), data)
+    except struct.error:
+        raise PEError("corrupt icon group")
+    if best is None:
+        return None
+    ico = struct.pack("<HHH", 0, 1, 1) + best[1] + best[2]
+    with Image.open(BytesIO(ico)) as img:
+        icon = img.convert("RGBA")
+    icon = icon.resize((side, side), Image.LANCZOS)
+    canvas = Image.new("RGBA", size, (0, 0, 0, 0))
+    canvas.paste(icon, ((size[0] - side) // 2, (size[1] - side) // 2), icon)
+    return canvas
+
+
+def non_game_reason(path):
+    # None for executables that look like games, otherwise why the scan should skip them.
+    # Cheapest checks first: the file name, then the PE headers, then the version strings.
+    if NON_GAME_EXE_PATTERN.match(os.path.basename(path)):
+        return "file name"
+    try:
+        pe = PEFile(path)
+    except (OSError, PEError) as e:
+        return f"not a readable executable ({e})"
+    if pe.is_dll:
+        return "DLL"
+    if pe.subsystem != PEFile.SUBSYSTEM_WINDOWS_GUI:
+        return f"non-GUI subsystem {pe.subsystem}"
+    if pe.size < MIN_GAME_EXE_SIZE:
+        return "too small"
+    try:
+        strings = pe.version_strings()
+    except (OSError, PEError):
+        return None
+    described = " ".join(strings.get(key, "") for key in ("ProductName", "FileDescription", "OriginalFilename")).lower()
+    for keyword in NON_GAME_VERSION_KEYWORDS:
+        if keyword in described:
+            return f"version info mentions '{keyword}'"
+    return None
+
+
+def find_app_manifests(steamapps_dir):
+    # (appid, manifest path) for each appmanifest_<appid>.acf in a steamapps folder.
+    manifests = []
+    with os.scandir(steamapps_dir) as entries:
+        for entry in entries:
+            match = re.match(r"appmanifest_(\d+)\.acf$", entry.name)
+            if match and entry.is_file():
+                manifests.append((match.group(1), entry.path))
+    return manifests
+
+
+def parse_acf(text):
+    # Valve KeyValues text, as in appmanifest_*.acf -> nested dicts with lower-cased keys.
+    root = {}
+    stack = [root]
+    key = None
+    for quoted, brace in re.findall(r'"((?:[^"\\]|\\.)*)"|([{}])', text):
+        if brace == "{":
+            child = {}
+            stack[-1][(key or "").lower()] = child
+            stack.append(child)
+            key = None
+        elif brace == "}":
+            if len(stack) > 1:
+                stack.pop()
+            key = None
+        elif key is None:
+            key = quoted
+        else:
+            stack[-1][key.lower()] = quoted.replace("\\\\", "\\")
+            key = None
+    return root
+
+
+def read_app_manifest(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return parse_acf(f.read()).get("appstate", {})
+
+
+def primary_game_exe(install_dir, name="", max_depth=3):
+    # Cheap guess at the executable a Steam game launches: a shallow scandir of the install
+    # folder (no full walk), dropping helpers via non_game_reason, then preferring names close
+    # to the game's or folder's name, shallow paths and larger files.
+    targets = [compact for compact in (normalize_app_name(name).replace(" ", ""),
+                                       normalize_app_name(os.path.basename(install_dir)).replace(" ", "")) if compact]
+    best = None
+    best_score = None
+    stack = [(install_dir, 0)]
+    while stack:
+        folder, depth = stack.pop()
+        try:
+            with os.scandir(folder) as entries:
+                entries = list(entries)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if depth < max_depth and entry.name.lower() not in PRUNED_SCAN_DIRS:
+                        stack.append((entry.path, depth + 1))
+                    continue
+                if not entry.name.lower().endswith(".exe") or non_game_reason(entry.path):
+                    continue
+                size = entry.stat().st_size
+            except OSError:
+                continue
+            stem = normalize_app_name(os.path.splitext(entry.name)[0]).replace(" ", "")
+            similarity = max((difflib.SequenceMatcher(None, stem, target).ratio() for target in targets), default=0)
+            score = similarity - 0.25 * depth + 0.1 * min(size / (100 * 1024 * 1024), 1)
+            if best_score is None or score > best_score:
+                best, best_score = entry.path, score
+    return best
+
+
+def normalize_app_name(name):
+    return " ".join(re.sub(r"[\W_]+", " ", name.lower()).split())
+
+
+class AppListMatcher:
+    # Maps cleaned exe names to app-list entries without the network. An inverted token index
+    # narrows the app list down to a few candidates, which are then scored by token overlap
+    # and difflib similarity; an exact match on the name with spaces removed scores 1.0.
+    MAX_CANDIDATES = 200
+    COMMON_TOKEN_POSTINGS = 20000  # Tokens like "the" only count when nothing rarer matched
+
+    def __init__(self, apps):
+        self._apps = []
+        self._names = []
+        self._by_token = {}
+        self._by_compact = {}
+        for app in apps:
+            norm = normalize_app_name(app.get("name") or "")
+            if not norm:
+                continue
+            idx = len(self._apps)
+            self._apps.append(app)
+            self._names.append(norm)
+            for token in set(norm.split()):
+                self._by_token.setdefault(token, []).append(idx)
+            compact = norm.replace(" ", "")
+            self._by_compact.setdefault(compact, idx)
+            if norm.startswith("the "):
+                self._by_compact.setdefault(compact[3:], idx)
+
+    def __len__(self):
+        return len(self._apps)
+
+    def match(self, query):
+        # Returns (app, score) for the best candidate, or (None, 0.0).
+        norm = normalize_app_name(query)
+        if not norm:
+            return None, 0.0
+        idx = self._by_compact.get(norm.replace(" ", ""))
+        if idx is not None:
+            return self._apps[idx], 1.0
+        query_tokens = set(norm.split())
+        postings = sorted((self._by_token[t] for t in query_tokens if t in self._by_token), key=len)
+        counts = {}
+        for plist in postings:
+            if counts and len(plist) > self.COMMON_TOKEN_POSTINGS:
+                continue
+            for idx in plist:
+                counts[idx] = counts.get(idx, 0) + 1
+        if not counts:
+            return None, 0.0
+        candidates = heapq.nlargest(self.MAX_CANDIDATES, counts, key=lambda i: (counts[i], -len(self._names[i])))
+        best, best_score = None, 0.0
+        matcher = difflib.SequenceMatcher(None, "", norm)  # seq2 analysis is cached across candidates
+        for idx in candidates:
+            name = self._names[idx]
+            tokens = set(name.split())
+            overlap = len(query_tokens & tokens) / len(query_tokens | tokens)
+            matcher.set_seq1(name)
+            # The quick ratios are upper bounds on ratio(); skip the full diff when they can't win.
+            if (overlap + matcher.real_quick_ratio()) / 2 <= best_score or (overlap + matcher.quick_ratio()) / 2 <= best_score:
+                continue
+            score = (overlap + matcher.ratio()) / 2
+            if score > best_score:
+                best, best_score = idx, score
+        return self._apps[best], best_score
+
+
+class FolderScan:
+    # Walks a folder (top-level subdirectories in parallel, skipping PRUNED_SCAN_DIRS) and
+    # resolves the executables it finds on a bounded pool. Nothing here touches Tk: resolved
+    # items are queued on `events` in batches (None marks the end) and the counters are read by
+    # the UI thread when it polls. Items are queued as their lookups finish, not in walk order;
+    # the library view places each one by its sort key anyway.
+    #
+    # With a checkpoint_path the scan state (finished directories with their mtimes, the
+    # frontier still to walk, executables awaiting a lookup and the items resolved so far) is
+    # saved every SCAN_CHECKPOINT_INTERVAL seconds and at the end. A scan that was cancelled,
+    # crashed or ran out of budget resumes from its frontier; once a scan has completed, the
+    # next one re-lists only directories whose mtime changed.
+    def __init__(self, folder, is_known, resolve, skip_reason=non_game_reason, max_exes=500, max_seconds=0,
+                 workers=RESOLVE_WORKERS, walkers=SCAN_WALKERS, checkpoint_path=None):
+        self.folder = folder
+        self.is_known = is_known
+        self.resolve = resolve
+        self.skip_reason = skip_reason
+        self.max_exes = max_exes
+        self.max_seconds = max_seconds
+        self.walkers = walkers
+        self.checkpoint_path = checkpoint_path
+        self.events = queue.Queue()
+        self.cancelled = threading.Event()
+        self.dirs_visited = 0
+        self.dirs_unchanged = 0
+        self.exes_found = 0
+        self.exes_skipped = 0
+        self.resolved = 0
+        self.stop_reason = None
+        self.resumed = False
+        self.errors = []  # "path: error" for walkers and lookups that raised; a resumed scan retries them
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()  # Counters, stop_reason and the checkpoint state below
+        self._done_dirs = {}     # directory -> [mtime_ns, subdirectory names]
+        self._frontier = set()   # directories queued or being listed
+        self._pending = set()    # executables submitted for a lookup, not resolved yet
+        self._submitted = set()  # executables submitted during this run
+        self._resolved_items = []
+        self._seen_dirs = set()
+        self._finished = threading.Event()
+        self._save_lock = threading.Lock()
+        self._batch = []
+        self._batch_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    @property
+    def lookups_pending(self):
+        return self.exes_found - self.resolved
+
+    def start(self):
+        threading.Thread(target=self._walk, daemon=True).start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def _walk(self):
+        # Executables directly in the folder first, then each top-level subdirectory on its own
+        # walker thread; found executables go to the resolver pool as soon as they are seen.
+        started = time.monotonic()
+        try:
+            seeds = self._load_checkpoint()
+            if self.checkpoint_path:
+                threading.Thread(target=self._checkpoint_loop, daemon=True).start()
+            if seeds is None:
+                self._frontier.add(self.folder)
+                seeds = self._visit(self.folder)
+            with ThreadPoolExecutor(max_workers=self.walkers) as walkers:
+                futures = {walkers.submit(self._walk_tree, seed, started): seed for seed in seeds}
+            # A failed walker leaves its subtree on the frontier, so the checkpoint stays incomplete.
+            for future, seed in futures.items():
+                if future.exception() is not None:
+                    self._record_error(seed, future.exception())
+        except Exception as e:
+            self._record_error(self.folder, e)
+        finally:
+            # Queued lookups still run after a cancel, but return immediately.
+            self._pool.shutdown(wait=True)
+            if self.cancelled.is_set() and self.stop_reason is None:
+                self.stop_reason = "cancelled"  # Cancelled while lookups were still running
+            with self._batch_lock:
+                if self._batch:
+                    self.events.put(self._batch)
+                    self._batch = []
+            self._finished.set()
+            self._save_checkpoint()
+            self.events.put(None)
+
+    def _walk_tree(self, top, started):
+        # Depth-first in os.walk's top-down order.
+        stack = [top]
+        while stack and not self._stopped(started):
+            stack.extend(reversed(self._visit(stack.pop())))
+
+    def _stopped(self, started):
+        with self._lock:
+            if self.stop_reason is None:
+                if self.cancelled.is_set():
+                    self.stop_reason = "cancelled"
+                elif self.max_seconds and time.monotonic() - started >= self.max_seconds:
+                    self.stop_reason = f"time limit of {self.max_seconds}s reached"
+            return self.stop_reason is not None
+
+    def _visit(self, folder):
+        # One scandir pass (entry types come from the directory listing, no stat per file).
+        # A directory finished by an earlier scan and unchanged since is not listed at all.
+        # Returns the subdirectories left to walk.
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            mtime = None
+        with self._lock:
+            self._seen_dirs.add(folder)
+            known = self._done_dirs.get(folder)
+            if mtime is not None and known is not None and known[0] == mtime:
+                subdirs = [os.path.join(folder, name) for name in known[1]]
+                self.dirs_unchanged += 1
+                self._frontier.update(subdirs)
+                self._frontier.discard(folder)
+                return subdirs
+        subdirs = []
+        exes = []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name.lower() not in PRUNED_SCAN_DIRS:
+                                subdirs.append(entry.path)
+                        elif entry.name.lower().endswith(".exe"):
+                            exes.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            with self._lock:
+                self._frontier.discard(folder)
+            return []
+        with self._lock:
+            self.dirs_visited += 1
+        for full_path in exes:
+            if self.is_known(full_path) or full_path in self._submitted:
+                continue
+            if self.skip_reason and self.skip_reason(full_path):
+                with self._lock:
+                    self.exes_skipped += 1
+                continue
+            if not self._submit(full_path):
+                return []  # Stopped part-way: the directory stays on the frontier
+        with self._lock:
+            self._done_dirs[folder] = [mtime, [os.path.basename(path) for path in subdirs]]
+            self._frontier.update(subdirs)
+            self._frontier.discard(folder)
+        return subdirs
+
+    def _submit(self, full_path):
+        with self._lock:
+            if self.stop_reason:
+                return False
+            if self.max_exes and self.exes_found >= self.max_exes:
+                self.stop_reason = f"limit of {self.max_exes} executables reached"
+                return False
+            self.exes_found += 1
+            self._submitted.add(full_path)
+            self._pending.add(full_path)
+        self._pool.submit(self._resolve_one, full_path)
+        return True
+
+    def _resolve_one(self, full_path):
+        item = None
+        if not self.cancelled.is_set():
+            try:
+                item = LibraryItem(full_path, self.resolve(full_path))
+            except Exception as e:
+                self._record_error(full_path, e)  # Stays pending
+            else:
+                with self._lock:
+                    self._pending.discard(full_path)
+                    self._resolved_items.append(item)
+        with self._batch_lock:
+            self.resolved += 1
+            if item:
+                self._batch.append(item)
+            if self._batch and (len(self._batch) >= SCAN_BATCH_SIZE or time.monotonic() - self._last_flush >= SCAN_BATCH_INTERVAL):
+                self.events.put(self._batch)
+                self._batch = []
+                self._last_flush = time.monotonic()
+
+    def _record_error(self, path, error):
+        with self._lock:
+            self.errors.append(f"{path}: {error}")
+
+    def _load_checkpoint(self):
+        # Returns the frontier to resume from, or None to walk from the top.
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") != SCAN_CHECKPOINT_VERSION:
+                return None
+            done_dirs = dict(state["dirs"])
+            if state["complete"]:
+                self._done_dirs = done_dirs
+                return None
+            # Everything is read before anything is used, so a damaged checkpoint is dropped whole.
+            resolved = [LibraryItem.from_dict(data) for data in state["resolved"]]
+            pending = [str(path) for path in state["pending"]]
+            frontier = [str(path) for path in state["frontier"]]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        self._done_dirs = done_dirs
+        # Items resolved before the interruption that never reached the library.
+        unsaved = [item for item in resolved if not self.is_known(item.path)]
+        if unsaved:
+            self.events.put(unsaved)
+        self._resolved_items = resolved
+        self.resumed = True
+        for full_path in pending:
+            if not self.is_known(full_path) and os.path.exists(full_path) and not self._submit(full_path):
+                break
+        self._frontier.update(frontier)
+        return sorted(self._frontier)
+
+    def _checkpoint_loop(self):
+        while not self._finished.wait(SCAN_CHECKPOINT_INTERVAL):
+            self._save_checkpoint(periodic=True)
+
+    def _save_checkpoint(self, periodic=False):
+        if not self.checkpoint_path:
+            return
+        with self._save_lock:
+            # A periodic save must never land after the final one.
+            if not (periodic and self._finished.is_set()):
+                self._write_checkpoint()
+
+    def _write_checkpoint(self):
+        with self._lock:
+            complete = not self._frontier and not self._pending
+            dirs = self._done_dirs
+            if complete and not self.resumed:
+                # A walk from the top has seen every directory still on disk.
+                dirs = {path: entry for path, entry in dirs.items() if path in self._seen_dirs}
+            state = {
+                "version": SCAN_CHECKPOINT_VERSION,
+                "folder": self.folder,
+                "complete": complete,
+                "dirs": dict(dirs),
+                "frontier": sorted(self._frontier),
+                "pending": sorted(self._pending),
+                "resolved": [] if complete else [item.to_dict() for item in self._resolved_items],
+            }
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint_path)), exist_ok=True)
+            with atomic_write(self.checkpoint_path, suffix=".json") as f:
+                json.dump(state, f)
+        except OSError:
+            pass
+
+
+def storage_root(path):
+    # The drive or share a path lives on: 'D:\\', '\\\\server\\share\\', or the filesystem root elsewhere.
+    drive = os.path.splitdrive(path)[0]
+    return drive + os.sep if drive else os.sep
+
+
+def is_network_root(root):
+    if root.startswith(("\\\\", "//")):
+        return True
+    if os.name == "nt":
+        try:
+            return win32file.GetDriveType(root) == win32con.DRIVE_REMOTE
+        except Exception:
+            return False
+    return False
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def game_install_root(exe_path):
+    # The folder a game occupies: the child of a Steam "common" folder when there is one,
+    # otherwise the executable's folder minus trailing bin/x64-style levels. None for an
+    # executable directly on a drive or share root, or directly in a "common" folder, whose
+    # size would be the whole volume or Steam library.
+    folder = os.path.dirname(exe_path)
+    # One search for the deepest "common" ancestor instead of a dirname() per level.
+    lowered = os.sep + folder.lower()
+    if os.altsep:
+        lowered = lowered.replace(os.altsep, os.sep)
+    marker = os.sep + "common" + os.sep
+    at = lowered.rfind(marker)
+    if at >= 0:
+        end = lowered.find(os.sep, at + len(marker))
+        return folder if end < 0 else folder[:end - 1]
+    if lowered.endswith(os.sep + "common"):
+        return None
+    while os.path.basename(folder).lower() in INSTALL_SUBDIRS and os.path.dirname(folder) != folder:
+        folder = os.path.dirname(folder)
+    if os.path.dirname(folder) == folder:
+        return None
+    return folder
+
+
+def shared_install_roots(roots):
+    # Keys of the install roots that contain another one, e.g. 'D:\\Games' for a loose
+    # 'D:\\Games\\foo.exe' next to 'D:\\Games\\Bar\\bar.exe': sizing them would count other games.
+    keys = sorted({library_path_key(root) for root in roots})
+    shared = set()
+    for key in keys:
+        prefix = key.rstrip(os.sep) + os.sep
+        index = bisect.bisect_left(keys, prefix)
+        if index < len(keys) and keys[index].startswith(prefix):
+            shared.add(key)
+    return shared
+
+
+def _dir_usage(folder):
+    # (bytes of the files directly in folder, its subdirectories); symlinks are not followed.
+    total = 0
+    subdirs = []
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return total, subdirs
+
+
+def _tree_usage(top):
+    total = 0
+    stack = [top]
+    while stack:
+        size, subdirs = _dir_usage(stack.pop())
+        total += size
+        stack.extend(subdirs)
+    return total
+
+
+def folder_size(folder, pool=None):
+    # Bytes used under folder; its top-level subdirectories are summed in parallel on `pool`.
+    total, subdirs = _dir_usage(folder)
+    return total + sum((pool.map if pool else map)(_tree_usage, subdirs))
+
+
+class DiskUsage:
+    # Sizes of game folders, or the SizeOnDisk of a Steam app manifest (falling back to its
+    # install folder), computed on a background thread and cached in SIZE_CACHE_FILE with the
+    # mtime they were computed at. get() never touches the disk: it returns the cached size and
+    # queues one revalidation per path per session; on_ready(path) runs when a size changes.
+    def __init__(self, on_ready, cache_file=SIZE_CACHE_FILE, workers=SIZE_WORKERS):
+        self.on_ready = on_ready
+        self.cache_file = cache_file
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self._queued = set()
+        self._queue = queue.Queue()
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._dirty = False
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def load(self):
+        # Reads the cache file; sizes computed before it was loaded are kept.
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                sizes = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            sizes.update(self._sizes)
+            self._sizes = sizes
+
+    def get(self, path):
+        key = library_path_key(path)
+        with self._lock:
+            entry = self._sizes.get(key)
+            if key not in self._queued:
+                self._queued.add(key)
+                self._queue.put(path)
+        return entry[1] if entry else None
+
+    def clear(self):
+        with self._lock:
+            self._sizes = {}
+            self._queued = set()
+            self._dirty = False
+        try:
+            os.remove(self.cache_file)
+        except OSError:
+            pass
+
+    def _run(self):
+        while True:
+            path = self._queue.get()
+            try:
+                self._validate(path)
+            except Exception:
+                pass
+            if self._queue.empty() and self._dirty:
+                self._save()
+
+    def _validate(self, path):
+        key = library_path_key(path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        with self._lock:
+            entry = self._sizes.get(key)
+        if entry is not None and entry[0] == mtime:
+            return
+        size = self._manifest_size(path) if path.lower().endswith(".acf") else folder_size(path, self._pool)
+        with self._lock:
+            self._sizes[key] = [mtime, size]
+            self._dirty = True
+        if entry is None or entry[1] != size:
+            self.on_ready(path)
+
+    def _manifest_size(self, path):
+        manifest = read_app_manifest(path)
+        try:
+            size = int(manifest.get("sizeondisk", "0"))
+        except ValueError:
+            size = 0
+        if not size and manifest.get("installdir"):
+            size = folder_size(os.path.join(os.path.dirname(path), "common", manifest["installdir"]), self._pool)
+        return size
+
+    def _save(self):
+        with self._lock:
+            snapshot = dict(self._sizes)
+            self._dirty = False
+        try:
+            with atomic_write(self.cache_file, suffix=".json") as f:
+                json.dump(snapshot, f)
+        except OSError:
+            with self._lock:
+                self._dirty = True
+
+
+class Prefetcher:
+    # Fetches metadata for queued appids on one low-priority thread: only while is_idle() holds,
+    # at most one request per `interval`, newest requests first, skipping what is_cached() covers.
+    # on_drained() runs whenever the queue empties after at least one fetch.
+    def __init__(self, fetch, is_cached, is_idle, on_drained=None, interval=PREFETCH_INTERVAL):
+        self.fetch = fetch
+        self.is_cached = is_cached
+        self.is_idle = is_idle
+        self.on_drained = on_drained
+        self.interval = interval
+        self._pending = OrderedDict()  # appid -> None, most recent last
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def add(self, appids):
+        with self._lock:
+            for appid in appids:
+                appid = str(appid)
+                self._pending.pop(appid, None)
+                self._pending[appid] = None
+            if self._pending:
+                self._wake.set()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _run(self):
+        fetched = 0
+        while True:
+            self._wake.wait()
+            if not self.is_idle():
+                time.sleep(0.5)
+                continue
+            with self._lock:
+                if not self._pending:
+                    self._wake.clear()
+                    appid = None
+                else:
+                    appid = self._pending.popitem(last=True)[0]
+            if appid is None:
+                if fetched and self.on_drained:
+                    self.on_drained()
+                fetched = 0
+                continue
+            if self.is_cached(appid):
+                continue
+            try:
+                self.fetch(appid)
+                fetched += 1
+            except Exception:
+                pass
+            time.sleep(self.interval)
+
+
+def process_matches(pid, target):
+    # Whether process `pid` was started from the executable whose library_path_key is `target`.
+    if os.name == "nt":
+        try:
+            handle = win32api.OpenProcess(win32con.PROCESS_QUERY_INFORMATION | win32con.PROCESS_VM_READ, False, pid)
+        except win32api.error:
+            return False
+        try:
+            return library_path_key(win32process.GetModuleFileNameEx(handle, 0)) == target
+        except win32api.error:
+            return False
+        finally:
+            win32api.CloseHandle(handle)
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            argv = f.read().split(b"\0")[:2]
+    except OSError:
+        return False
+    # argv[1] covers scripts started through their interpreter; exited (zombie) processes have no argv.
+    return any(arg and library_path_key(os.fsdecode(arg)) == target for arg in argv)
+
+
+def process_ids(target):
+    # PIDs of all processes started from `target` (a library_path_key); [] where processes can't be listed.
+    if os.name == "nt":
+        pids = win32process.EnumProcesses()
+    else:
+        try:
+            pids = [int(entry) for entry in os.listdir("/proc") if entry.isdigit()]
+        except OSError:
+            return []
+    return [pid for pid in pids if pid != os.getpid() and process_matches(pid, target)]
+
+
+class SteamSupervisor:
+    # Launches and stops the Steam client and tracks whether it is running. `exe_path()` gives the
+    # executable to launch and watch. launch() and terminate() block, so callers run them off the UI
+    # thread; after start() a daemon thread re-checks the state every `interval` seconds. That only
+    # looks at the known PIDs and the process this app launched: listing every process is left to
+    # launch(), terminate() and a scan every `scan_interval` seconds for a Steam started elsewhere.
+    # on_change(running) is called from whichever thread sees the state flip.
+    def __init__(self, exe_path, on_change=None, interval=STEAM_POLL_SECONDS, scan_interval=STEAM_SCAN_SECONDS):
+        self.exe_path = exe_path
+        self.on_change = on_change
+        self.interval = interval
+        self.scan_interval = scan_interval
+        self.running = False
+        self._pids = []
+        self._process = None  # Popen of a Steam this app launched, reaped once it exits
+        self._next_scan = 0.0  # time.monotonic() after which a poll lists every process again
+        self._lock = threading.Lock()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def launch(self, helper=None):
+        # Returns False if Steam was already running.
+        if self.refresh():
+            return False
+        exe = self.exe_path()
+        self._process = subprocess.Popen([exe], cwd=os.path.dirname(exe))
+        if helper and os.path.exists(helper):
+            p = subprocess.Popen([helper])
+            time.sleep(STEAM_HELPER_SECONDS)
+            p.kill()
+        self.refresh()
+        return True
+
+    def terminate(self, timeout=STEAM_STOP_TIMEOUT):
+        # Returns False if Steam was not running.
+        if not self.refresh():
+            return False
+        for pid in list(self._pids):
+            try:
+                os.kill(pid, signal.SIGTERM)  # TerminateProcess on Windows
+            except OSError:
+                pass
+        deadline = time.monotonic() + timeout
+        while self.refresh(scan=False):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Steam is still running after {timeout} seconds")
+            time.sleep(0.2)
+        return True
+
+    def refresh(self, scan=True):
+        # With scan=False the process list is only searched when Steam seems to have just stopped
+        # (it restarts itself to update) or once scan_interval has passed.
+        exe = self.exe_path()
+        with self._lock:
+            if self._process is not None and self._process.poll() is not None:
+                self._process = None
+                scan = True
+            target = library_path_key(exe) if exe else None
+            pids = [pid for pid in self._pids if process_matches(pid, target)] if target else []
+            scan = scan or self.running or time.monotonic() >= self._next_scan
+            if target and not pids and self._process is None and scan:
+                pids = process_ids(target)
+                self._next_scan = time.monotonic() + self.scan_interval
+            if self._process is not None and self._process.pid not in pids:
+                pids.append(self._process.pid)  # Counts even if it has re-executed itself
+            self._pids = pids
+            changed = bool(pids) != self.running
+            self.running = bool(pids)
+        if changed and self.on_change:
+            self.on_change(self.running)
+        return self.running
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh(scan=False)
+            except Exception:
+                pass
+            time.sleep(self.interval)
+
+
+class TaskExecutor:
+    # One thread pool for slow work started from the UI. submit() returns a Future; when it finishes,
+    # on_done(result) or on_error(exception) is queued on `results` and runs on the UI thread, which
+    # calls drain(). Cancelled tasks never call back, even if they were already running, and a task
+    # submitted with a `key` cancels the previous one with that key (a newer search supersedes).
+    # call_soon() is how any other thread reaches the UI: only the thread calling drain() runs it.
+    def __init__(self, on_error=None, workers=TASK_WORKERS):
+        self.on_error = on_error
+        self.results = queue.Queue()
+        self.calls = queue.Queue()  # (fn, args) from call_soon(), run in order by drain()
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._pending = set()  # Futures whose callbacks have not run and are still wanted
+        self._keys = {}        # key -> latest future submitted with it
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, on_done=None, on_error=None, key=None):
+        future = self._pool.submit(fn, *args)
+        with self._lock:
+            self._pending.add(future)
+            previous = self._keys.get(key) if key is not None else None
+            if key is not None:
+                self._keys[key] = future
+        if previous is not None:
+            self.cancel(previous)
+        future.add_done_callback(lambda f: self.results.put((f, key, on_done, on_error)))
+        return future
+
+    def cancel(self, future):
+        future.cancel()
+        with self._lock:
+            self._pending.discard(future)
+
+    def call_soon(self, fn, *args):
+        self.calls.put((fn, args))
+
+    def drain(self):
+        while True:
+            try:
+                fn, args = self.calls.get_nowait()
+            except queue.Empty:
+                break
+            fn(*args)
+        while True:
+            try:
+                future, key, on_done, on_error = self.results.get_nowait()
+            except queue.Empty:
+                return
+            with self._lock:
+                if key is not None and self._keys.get(key) is future:
+                    del self._keys[key]
+                wanted = future in self._pending
+                self._pending.discard(future)
+            if not wanted or future.cancelled():
+                continue
+            error = future.exception()
+            if error is None:
+                if on_done:
+                    on_done(future.result())
+            elif on_error or self.on_error:
+                (on_error or self.on_error)(error)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class IdleScheduler:
+    # Runs maintenance jobs on one background thread, only between resume() and pause() (while the
+    # window is hidden in the tray). Each turn gives the most overdue job its budget: job(deadline,
+    # stop) does a slice of work and returns True once it has caught up (it runs again after its
+    # interval) or False to continue next turn. Turns are `rest` seconds apart. pause() sets `stop`,
+    # which jobs check between units of work; a job that raises is retried with exponential backoff.
+    def __init__(self, on_error=None, budget=IDLE_JOB_BUDGET, rest=IDLE_JOB_PAUSE, max_backoff=IDLE_BACKOFF_MAX):
+        self.on_error = on_error
+        self.budget = budget
+        self.rest = rest
+        self.max_backoff = max_backoff
+        self.jobs = []  # [name, job, interval, budget, next run (monotonic), consecutive failures]
+        self.stop = threading.Event()
+        self.stop.set()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def add(self, name, job, interval=IDLE_JOB_INTERVAL, budget=None):
+        self.jobs.append([name, job, interval, budget or self.budget, 0.0, 0])
+        self._wake.set()
+
+    def resume(self):
+        self.stop.clear()
+        self._wake.set()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def pause(self):
+        self.stop.set()
+        self._wake.set()
+
+    def _run(self):
+        rested = 0.0
+        while True:
+            if self.stop.is_set():
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            job = min(self.jobs, key=lambda job: job[4], default=None)
+            now = time.monotonic()
+            due = max(job[4], rested) if job else None
+            if due is None or due > now:
+                self._wake.wait(None if due is None else due - now)
+                self._wake.clear()
+                continue
+            name, run, interval, budget = job[:4]
+            try:
+                done = run(now + budget, self.stop)
+            except Exception as e:
+                job[5] += 1
+                job[4] = time.monotonic() + min(self.rest * 2 ** job[5], self.max_backoff)
+                if self.on_error:
+                    self.on_error(name, e)
+            else:
+                job[5] = 0
+                job[4] = time.monotonic() + (interval if done else self.rest)
+            rested = time.monotonic() + self.rest
+
+
+class HealthCheck:
+    # Stats library paths in the background with one bounded pool per drive or share, so a slow
+    # disk or server never holds up the others: a few concurrent stats on local drives, many on
+    # network shares. Results are queued on `events` in batches of (path, status), with status
+    # "ok", "missing" or "unreachable" (drive offline, access denied); None marks the end.
+    def __init__(self, paths):
+        self.paths = paths
+        self.total = len(paths)
+        self.checked = 0
+        self.missing = 0
+        self.events = queue.Queue()
+        self.cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._batch = []
+        self._last_flush = time.monotonic()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def _run(self):
+        try:
+            groups = {}
+            for path in self.paths:
+                groups.setdefault(storage_root(path), []).append(path)
+            pools = []
+            for root, group in groups.items():
+                if not os.path.exists(root):
+                    # The whole drive or share is offline; its games are not missing.
+                    self._report([(path, "unreachable") for path in group])
+                    continue
+                pool = ThreadPoolExecutor(max_workers=HEALTH_NETWORK_WORKERS if is_network_root(root) else HEALTH_LOCAL_WORKERS)
+                group.sort()  # Neighbouring paths together, for directory locality
+                for start in range(0, len(group), 64):
+                    pool.submit(self._check, group[start:start + 64])
+                pools.append(pool)
+            for pool in pools:
+                pool.shutdown(wait=True)
+        finally:
+            with self._lock:
+                if self._batch:
+                    self.events.put(self._batch)
+                    self._batch = []
+            self.events.put(None)
+
+    def _check(self, paths):
+        results = []
+        for path in paths:
+            if self.cancelled.is_set():
+                break
+            try:
+                os.stat(path)
+                status = "ok"
+            except (FileNotFoundError, NotADirectoryError):
+                status = "missing"
+            except OSError:
+                status = "unreachable"
+            results.append((path, status))
+        self._report(results)
+
+    def _report(self, results):
+        with self._lock:
+            self.checked += len(results)
+            self.missing += sum(status == "missing" for _, status in results)
+            self._batch.extend(results)
+            if len(self._batch) >= SCAN_BATCH_SIZE or time.monotonic() - self._last_flush >= SCAN_BATCH_INTERVAL:
+                self.events.put(self._batch)
+                self._batch = []
+                self._last_flush = time.monotonic()
+
+
+class CsvTask:
+    # Library CSV import/export on a worker thread. Progress is `done` out of `total` (bytes for
+    # imports, rows for exports). `events` carries chunks of items for the UI thread to merge and
+    # None at the end, after which `error` holds any failure.
+    def __init__(self, filename):
+        self.filename = filename
+        self.events = queue.Queue(maxsize=CSV_QUEUE_CHUNKS)
+        self.cancelled = threading.Event()
+        self.done = 0
+        self.total = 0
+        self.error = None
+
+    def start(self):
+        threading.Thread(target=self._main, daemon=True).start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def _main(self):
+        try:
+            self._run()
+        except TaskCancelled:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            self.events.put(None)
+
+    def _put(self, chunk):
+        # Blocks while the UI is behind, which is what keeps memory flat on huge files.
+        while True:
+            if self.cancelled.is_set():
+                raise TaskCancelled()
+            try:
+                self.events.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+class CsvImport(CsvTask):
+    def __init__(self, filename):
+        super().__init__(filename)
+        self.rows = 0
+
+    def _lines(self, f):
+        # Binary lines so progress can count bytes; csv accepts any iterable of strings.
+        for line in f:
+            self.done += len(line)
+            yield line.decode("utf-8")
+
+    def _run(self):
+        self.total = os.path.getsize(self.filename)
+        with open(self.filename, "rb") as f:
+            chunk = []
+            for row in csv.DictReader(self._lines(f)):
+                if self.cancelled.is_set():
+                    raise TaskCancelled()
+                self.rows += 1
+                path = row.get("Path") or ""
+                if not path:
+                    continue
+                date_added = row.get("Date Added")
+                chunk.append(LibraryItem(
+                    path,
+                    row.get("Name") or "",
+                    (row.get("Favorite") or "False").lower() == "true",
+                    None if date_added is None else parse_date_added(date_added)
+                ))
+                if len(chunk) >= CSV_CHUNK_SIZE:
+                    self._put(chunk)
+                    chunk = []
+            if chunk:
+                self._put(chunk)
+
+
+class CsvExport(CsvTask):
+    def __init__(self, filename, items):
+        super().__init__(filename)
+        self.items = items
+        self.total = len(items)
+
+    def _run(self):
+        with atomic_write(self.filename, suffix=".csv", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Name", "Path", "Favorite", "Date Added"])
+            for start in range(0, self.total, CSV_CHUNK_SIZE):
+                if self.cancelled.is_set():
+                    raise TaskCancelled()
+                chunk = self.items[start:start + CSV_CHUNK_SIZE]
+                writer.writerows([item.name, item.path, item.favorite, format_date_added(item.date_added)] for item in chunk)
+                self.done = start + len(chunk)
+
+
+class VirtualList(ctk.CTkFrame):
+    # A scrolling list that only builds widgets for the rows in view plus a small overscan.
+    # create_row(parent) builds one row widget; rows are recycled as the list scrolls and
+    # bind_row(row, item) fills one in for an item, so render cost follows the window height
+    # rather than the number of items. All rows share the same fixed height. With a `key`
+    # function rows are reconciled by item key: a row is only re-bound when the item it shows
+    # changes, and single items can be inserted, removed or looked up without a full reset.
+    def __init__(self, master, row_height, create_row, bind_row, key=None, overscan=2, **kwargs):
+        super().__init__(master, **kwargs)
+        self.row_height = row_height
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.key = key
+        self.overscan = overscan
+        self.items = []
+        self._offset = 0
+        self._slots = []       # [container, row, index of the bound item or None, key of the bound item]
+        self._positions = None  # Item key -> index, rebuilt lazily after the item list changes
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.empty_label = ctk.CTkLabel(self.viewport, text="", font=("Helvetica", 12))
+        self.viewport.bind("<Configure>", lambda event: self._render())
+        # Wheel events are bound on a tag of our own that every widget inside the list carries,
+        # so they only fire over this list and the bindings go away with it.
+        self._wheel_tag = "VirtualListWheel%d" % id(self)
+        self._wheel_events = ("<Button-4>", "<Button-5>") if sys.platform.startswith("linux") else ("<MouseWheel>",)
+        for sequence in self._wheel_events:
+            self.bind_class(self._wheel_tag, sequence, self._on_mousewheel)
+        self._tag_wheel(self)
+
+    def destroy(self):
+        for sequence in self._wheel_events:
+            self.unbind_class(self._wheel_tag, sequence)
+        super().destroy()
+
+    def _tag_wheel(self, widget):
+        # Also reached after bind_row, since CTk widgets create their image and text labels lazily.
+        tags = widget.bindtags()
+        if self._wheel_tag not in tags:
+            widget.bindtags((self._wheel_tag,) + tags)
+        for child in widget.winfo_children():
+            self._tag_wheel(child)
+
+    def set_items(self, items, keep_position=False, empty_text=""):
+        self.items = items
+        self._positions = None
+        self.empty_label.configure(text=empty_text)
+        if not keep_position:
+            self._offset = 0
+        if self.key is None:
+            for slot in self._slots:
+                slot[3] = None
+        self._render()
+
+    def refresh(self, match=None):
+        # Re-bind the rows on screen, or only those whose item satisfies `match`.
+        for container, row, index, key in self._slots:
+            if index is not None and (match is None or match(self.items[index])):
+                self.bind_row(row, self.items[index])
+                self._tag_wheel(container)
+
+    def index_of(self, key):
+        if self._positions is None:
+            self._positions = {self.key(item): i for i, item in enumerate(self.items)}
+        return self._positions.get(key)
+
+    def row_for(self, key):
+        # The row widget currently showing the item with `key`, or None if it is off screen.
+        for container, row, index, bound_key in self._slots:
+            if index is not None and bound_key == key:
+                return row
+        return None
+
+    def insert_items(self, items, position):
+        # position(item) gives the insertion index against the list as it stands at that point.
+        for item in items:
+            self.items.insert(position(item), item)
+        self._positions = None
+        self._render()
+
+    def remove(self, key):
+        index = self.index_of(key)
+        if index is None:
+            return False
+        del self.items[index]
+        self._positions = None
+        self._render()
+        return True
+
+    def _view_height(self):
+        return max(self.viewport.winfo_height() / self._get_widget_scaling(), 1)
+
+    def _render(self):
+        view_height = self._view_height()
+        total = len(self.items) * self.row_height
+        self._offset = max(0, min(self._offset, total - view_height))
+        first = max(0, int(self._offset // self.row_height) - self.overscan)
+        last = min(len(self.items), int((self._offset + view_height) // self.row_height) + 1 + self.overscan)
+        while len(self._slots) < last - first:
+            container = ctk.CTkFrame(self.viewport, fg_color="transparent", height=self.row_height)
+            container.pack_propagate(False)
+            row = self.create_row(container)
+            row.pack(fill="both", expand=True, padx=5, pady=3)
+            self._slots.append([container, row, None, None])
+        # Item i always lands in slot i % len(slots), so scrolling only re-binds rows entering the view.
+        shown = set()
+        for index in range(first, last):
+            slot = self._slots[index % len(self._slots)]
+            item = self.items[index]
+            key = self.key(item) if self.key else index
+            if slot[2] != index or slot[3] != key:
+                if slot[3] != key:
+                    self.bind_row(slot[1], item)
+                    self._tag_wheel(slot[0])
+                slot[2] = index
+                slot[3] = key
+            slot[0].place(x=0, y=index * self.row_height - self._offset, relwidth=1)
+            shown.add(index % len(self._slots))
+        for i, slot in enumerate(self._slots):
+            if i not in shown:
+                slot[0].place_forget()
+                slot[2] = None
+                slot[3] = None
+        if self.items:
+            self.empty_label.place_forget()
+            self.scrollbar.set(self._offset / total, min(1.0, (self._offset + view_height) / total))
+        else:
+            if self.empty_label.cget("text"):
+                self.empty_label.place(relx=0.5, y=10, anchor="n")
+            self.scrollbar.set(0, 1)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self._offset = float(value) * len(self.items) * self.row_height
+        elif action == "scroll":
+            self._offset += int(value) * (self.row_height if unit == "units" else self._view_height())
+        self._render()
+
+    def _on_mousewheel(self, event):
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        elif sys.platform == "darwin":
+            steps = -event.delta
+        else:
+            steps = -event.delta / 120
+        self._offset += steps * self.row_height
+        self._render()
+
 
 class SteamManagerApp:
-    def __init__(self):
+    def __init__(self, instance=None, command="show"):
+        # Single-instance lock (an InstanceServer, or None) and what this launch was asked to do.
+        self.instance = instance
+        self.launch_command = command
+
         # Configuration variables.
         self.config_file = 'config.ini'
         self.config = configparser.ConfigParser()
@@ -44,6 +1989,9 @@ class SteamManagerApp:
         self.minimalist_mode = False   # When True, only the sidebar is visible
         self.exit_to_tray = True       # When True, closing minimizes to tray; when False, it exits
         self.auto_dark_mode = False    # When True, automatically switch dark/light based on time
+        self.scan_max_exes = 500       # Folder scan budget by executable count (0 = no limit)
+        self.scan_max_seconds = 0      # Folder scan budget by walk time in seconds (0 = no limit)
+        self.steam_exe = ""            # Steam client to launch and watch ("" = steam.exe in the main path)
 
         # Logging.
         self.log_text = None
@@ -51,19 +1999,55 @@ class SteamManagerApp:
         self.log_history = []  # Keep last 50 log messages
 
         # Caches.
-        self.appid_cache = {}
+        self.appid_cache = {}          # AppID -> appdetails (APP_DETAILS_FIELDS only)
+        self.appid_fetched = {}        # AppID -> time.time() of the fetch, for revalidation
+        self.app_details_dirty = False
+        # Background threads only reach Tk through self.tasks.call_soon(), drained on the Tk thread.
+        self.tasks = TaskExecutor(on_error=lambda e: self.log(f"Background task failed: {str(e)}"))
+        self.prefetcher = Prefetcher(self.get_app_details, is_cached=lambda appid: appid in self.appid_cache,
+                                     is_idle=self.is_idle, on_drained=lambda: self.tasks.call_soon(self.save_app_details_cache))
+        self.last_activity = time.monotonic()
+        self.window_hidden = False
+        self.idle_scheduler = IdleScheduler(on_error=lambda name, e: self.log(f"Idle {name} failed: {str(e)}"))
+        self.resolve_cache = {}        # Cleaned exe name -> {"appid", "name"}, or None for no match
+        self.resolve_cache_dirty = False
+        self.resolve_lock = threading.Lock()
+        self.resolve_inflight = {}     # Cleaned exe name -> Event set when its lookup finishes
         self.full_app_list = None
         self.full_app_list_lower = None
+        self.header_image_cache = {}   # AppID -> 80x45 search thumbnail, or None
+        self.header_image_pending = set()  # AppIDs whose thumbnail is being fetched
+        self.name_lookups = {}         # AppID -> Future of the details fetch behind an installed game's name
+        self.icon_cache = IconCache(self.get_exe_icon, on_ready=lambda path: self.tasks.call_soon(self.on_icon_ready, path))
+        self.app_matcher = None        # AppListMatcher over full_app_list, built on first offline lookup
+        self.disk_usage = DiskUsage(on_ready=lambda path: self.tasks.call_soon(self.on_size_ready, path))
+        self.size_resort_job = None    # Pending root.after id for re-sorting size-sorted views
+        self.app_matcher_lock = threading.Lock()
+
+        # List views.
+        self.games_list = None
+        self.installed_manifests = {}  # AppID -> appmanifest path, for installed game sizes
+        self.installed_sort_method = "manifest"  # "manifest" or "size"
+        self.search_results_list = None
 
         # Library.
-        self.library_items = []
+        self.library_items = LibraryIndex()
+        self.library_list = None
+        self.library_filter_text = ""
+        self.library_filter_cache = None   # (library version, favorites version or None, filter text, matching keys)
+        self.library_size_roots = (None, {})  # (library version, item path -> (install folder, library_size_root()))
         self.show_favorites_only = False
-        self.library_sort_method = "name"  # "name" or "date"
+        self.library_sort_method = "name"  # "name", "date" or "size"
+        self.library_dirty = False         # Set when library_items has unsaved changes
+        self.library_save_job = None       # Pending root.after id for the write-behind save
+        self.health_status = {}            # Library path key -> [status, checked at] (see HealthCheck)
+        self.health_check = None           # Running HealthCheck, if any
+        self.library_health_btn = None
+        self.library_prune_btn = None
 
         # (Auto-refresh features have been removed.)
 
         self.load_config()
-        self.load_library()
 
         ctk.set_appearance_mode(self.saved_appearance_mode)
         ctk.set_default_color_theme(self.saved_theme)
@@ -81,12 +2065,19 @@ class SteamManagerApp:
         self.root.resizable(True, True)
         self.sidebar_frame = None
         self.content_frame = None
+        self.steam_status_label = None
+        self.steam = SteamSupervisor(self.steam_exe_path, on_change=lambda running: self.tasks.call_soon(self.update_steam_status))
 
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.root.after(TASK_POLL_MS, self.drain_tasks)
+        # Any key or click counts as activity; background prefetching waits for a quiet spell.
+        self.root.bind_all("<KeyPress>", self.note_activity, add="+")
+        self.root.bind_all("<ButtonPress>", self.note_activity, add="+")
 
         self.tray_icon = None
         self.tray_thread = None
-        self.setup_tray_icon()
+        if self.instance is not None:
+            self.instance.set_handler(lambda command: self.tasks.call_soon(self.handle_instance_command, command))
 
         self.show_loading_screen()
         self.root.mainloop()
@@ -108,7 +2099,10 @@ class SteamManagerApp:
                 self.minimalist_mode = self.config['Settings'].getboolean('minimalist_mode', False)
                 self.exit_to_tray = self.config['Settings'].getboolean('exit_to_tray', True)
                 self.auto_dark_mode = self.config['Settings'].getboolean('auto_dark_mode', False)
-            except (configparser.Error, KeyError):
+                self.scan_max_exes = self.config['Settings'].getint('scan_max_exes', 500)
+                self.scan_max_seconds = self.config['Settings'].getint('scan_max_seconds', 0)
+                self.steam_exe = self.config['Settings'].get('steam_exe', '')
+            except (configparser.Error, KeyError, ValueError):
                 self.config_error = "Config file is corrupted."
         else:
             self.saved_main_path = None
@@ -120,6 +2114,9 @@ class SteamManagerApp:
             self.minimalist_mode = False
             self.exit_to_tray = True
             self.auto_dark_mode = False
+            self.scan_max_exes = 500
+            self.scan_max_seconds = 0
+            self.steam_exe = ""
 
     def save_config(self, main_path=None, extra_paths=None, theme=None, appearance_mode=None):
         if not self.config.has_section('Paths'):
@@ -139,6 +2136,9 @@ class SteamManagerApp:
         self.config['Settings']['minimalist_mode'] = str(self.minimalist_mode)
         self.config['Settings']['exit_to_tray'] = str(self.exit_to_tray)
         self.config['Settings']['auto_dark_mode'] = str(self.auto_dark_mode)
+        self.config['Settings']['scan_max_exes'] = str(self.scan_max_exes)
+        self.config['Settings']['scan_max_seconds'] = str(self.scan_max_seconds)
+        self.config['Settings']['steam_exe'] = self.steam_exe
         with open(self.config_file, 'w') as configfile:
             self.config.write(configfile)
 
@@ -146,26 +2146,236 @@ class SteamManagerApp:
         if os.path.exists(LIBRARY_FILE):
             try:
                 with open(LIBRARY_FILE, "r", encoding="utf-8") as f:
-                    self.library_items = json.load(f)
+                    self.library_items = LibraryIndex(LibraryItem.from_dict(data) for data in json.load(f) if data.get("path"))
             except Exception as e:
                 self.log(f"Error loading library: {str(e)}")
-                self.library_items = []
+                self.library_items = LibraryIndex()
         else:
-            self.library_items = []
+            self.library_items = LibraryIndex()
 
     def save_library(self):
         try:
-            with open(LIBRARY_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.library_items, f, indent=4)
+            self.write_json_atomic(LIBRARY_FILE, self.library_items.to_list())
         except Exception as e:
+            self.library_dirty = True
             self.log(f"Error saving library: {str(e)}")
 
+    def load_resolve_cache(self):
+        if os.path.exists(RESOLVE_CACHE_FILE):
+            try:
+                with open(RESOLVE_CACHE_FILE, "r", encoding="utf-8") as f:
+                    self.resolve_cache = json.load(f)
+            except Exception as e:
+                self.log(f"Error loading resolve cache: {str(e)}")
+                self.resolve_cache = {}
+
+    def save_resolve_cache(self):
+        if not self.resolve_cache_dirty:
+            return
+        with self.resolve_lock:
+            snapshot = dict(self.resolve_cache)
+            self.resolve_cache_dirty = False
+        try:
+            self.write_json_atomic(RESOLVE_CACHE_FILE, snapshot)
+        except Exception as e:
+            self.resolve_cache_dirty = True
+            self.log(f"Error saving resolve cache: {str(e)}")
+
+    def load_app_details_cache(self):
+        if os.path.exists(APP_DETAILS_FILE):
+            try:
+                with open(APP_DETAILS_FILE, "r", encoding="utf-8") as f:
+                    for appid, (fetched, details) in json.load(f).items():
+                        self.appid_cache[appid] = details
+                        self.appid_fetched[appid] = fetched
+            except Exception as e:
+                self.log(f"Error loading app details cache: {str(e)}")
+
+    def save_app_details_cache(self):
+        if not self.app_details_dirty:
+            return
+        self.app_details_dirty = False
+        snapshot = {appid: [self.appid_fetched.get(appid, 0), details] for appid, details in list(self.appid_cache.items())}
+        try:
+            self.write_json_atomic(APP_DETAILS_FILE, snapshot, indent=None)
+        except Exception as e:
+            self.app_details_dirty = True
+            self.log(f"Error saving app details cache: {str(e)}")
+
+    def drain_tasks(self):
+        try:
+            self.tasks.drain()
+        finally:
+            self.root.after(TASK_POLL_MS, self.drain_tasks)
+
+    def note_activity(self, event=None):
+        self.last_activity = time.monotonic()
+
+    def is_idle(self):
+        return self.window_hidden or time.monotonic() - self.last_activity >= PREFETCH_IDLE_SECONDS
+
+    def revalidate_app_details(self, deadline, stop):
+        # Idle job: re-fetches the oldest cached store details, paced like the prefetcher and only
+        # while it has nothing queued, so the two never compete for the store API's rate limit.
+        if len(self.prefetcher):
+            return False
+        cutoff = time.time() - APP_DETAILS_MAX_AGE
+        stale = sorted((fetched, appid) for appid, fetched in list(self.appid_fetched.items()) if fetched < cutoff)
+        try:
+            for _, appid in stale:
+                if stop.is_set() or time.monotonic() >= deadline or len(self.prefetcher):
+                    return False
+                self.fetch_app_details(appid)
+                stop.wait(PREFETCH_INTERVAL)
+        finally:
+            if stale:
+                self.tasks.call_soon(self.save_app_details_cache)
+        return True
+
+    def recheck_library_health(self, deadline, stop):
+        # Idle job: re-checks paths whose status has gone stale, cancelling the check when shown.
+        if self.health_check is not None:
+            return False
+        cutoff = time.time() - HEALTH_MAX_AGE
+        stale = [item.path for item in list(self.library_items)
+                 if self.health_status.get(library_path_key(item.path), (None, 0))[1] < cutoff]
+        if not stale:
+            return True
+        check = HealthCheck(stale)
+        check.start()
+        while True:
+            if stop.is_set() or time.monotonic() >= deadline:
+                check.cancel()
+            try:
+                batch = check.events.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if batch is None:
+                break
+            self.tasks.call_soon(self.apply_health_results, [batch])
+        self.tasks.call_soon(self.save_health_cache)
+        self.tasks.call_soon(self.update_health_buttons)
+        return not check.cancelled.is_set()
+
+    def warm_icon_cache(self, deadline, stop):
+        # Idle job: extracts library icons to the disk cache so the library opens with them.
+        for item in list(self.library_items):
+            if stop.is_set() or time.monotonic() >= deadline:
+                return False
+            self.icon_cache.warm(item.path)
+        return True
+
+    def load_health_cache(self):
+        if os.path.exists(HEALTH_CACHE_FILE):
+            try:
+                with open(HEALTH_CACHE_FILE, "r", encoding="utf-8") as f:
+                    self.health_status = json.load(f)
+            except Exception as e:
+                self.log(f"Error loading health cache: {str(e)}")
+                self.health_status = {}
+
+    def save_health_cache(self):
+        try:
+            self.write_json_atomic(HEALTH_CACHE_FILE, self.health_status, indent=None)
+        except Exception as e:
+            self.log(f"Error saving health cache: {str(e)}")
+
+    def mark_library_dirty(self):
+        # Write-behind: the first change schedules a save, later changes in the window ride along.
+        self.library_dirty = True
+        if self.library_save_job is None:
+            self.library_save_job = self.root.after(LIBRARY_SAVE_DELAY_MS, self.flush_library)
+
+    def flush_library(self):
+        if self.library_save_job is not None:
+            try:
+                self.root.after_cancel(self.library_save_job)
+            except Exception:
+                pass
+            self.library_save_job = None
+        if self.library_dirty:
+            self.library_dirty = False
+            self.save_library()
+
+    def load_app_list(self, allow_network=True):
+        # Prefer the on-disk snapshot; only hit GetAppList when there is none (and it is allowed).
+        app_list = self.read_app_list_snapshot()
+        if app_list:
+            self.set_app_list(app_list)
+            return
+        if not allow_network:
+            return
+        r = requests.get("https://api.steampowered.com/ISteamApps/GetAppList/v2/", timeout=10)
+        self.store_app_list(r.json())
+
+    def store_app_list(self, app_list):
+        self.set_app_list(app_list)
+        self.log(f"Fetched app list with {len(app_list.get('applist', {}).get('apps', []))} apps.")
+        try:
+            self.write_json_atomic(APP_LIST_FILE, app_list, indent=None)
+        except Exception as e:
+            self.log(f"Error saving app list snapshot: {str(e)}")
+
+    def refresh_app_list(self, deadline, stop):
+        # Idle job: re-downloads a stale snapshot in chunks, giving up (to retry later) when shown.
+        try:
+            if time.time() - os.path.getmtime(APP_LIST_FILE) < APP_LIST_MAX_AGE:
+                return True
+        except OSError:
+            pass
+        with requests.get("https://api.steampowered.com/ISteamApps/GetAppList/v2/", timeout=10, stream=True) as r:
+            r.raise_for_status()
+            chunks = []
+            for chunk in r.iter_content(64 * 1024):
+                if stop.is_set() or time.monotonic() >= deadline:
+                    return False
+                chunks.append(chunk)
+        self.store_app_list(json.loads(b"".join(chunks)))
+        return True
+
+    def read_app_list_snapshot(self):
+        if not os.path.exists(APP_LIST_FILE):
+            return None
+        try:
+            with open(APP_LIST_FILE, "r", encoding="utf-8") as f:
+                app_list = json.load(f)
+            self.log(f"Loaded app list snapshot with {len(app_list.get('applist', {}).get('apps', []))} apps.")
+            return app_list
+        except Exception as e:
+            self.log(f"Error loading app list snapshot: {str(e)}")
+            return None
+
+    def set_app_list(self, app_list):
+        with self.app_matcher_lock:
+            self.full_app_list = app_list
+            self.full_app_list_lower = None
+            self.app_matcher = None
+
+    def get_app_matcher(self):
+        # Never touches the network: the matcher is only available once an app list is held locally.
+        with self.app_matcher_lock:
+            if self.app_matcher is None:
+                if self.full_app_list is None:
+                    self.full_app_list = self.read_app_list_snapshot()
+                app_list = self.full_app_list
+                if app_list:
+                    self.app_matcher = AppListMatcher(app_list.get("applist", {}).get("apps", []))
+            return self.app_matcher
+
+    def write_json_atomic(self, path, data, indent=4):
+        with atomic_write(path, suffix=".json") as f:
+            json.dump(data, f, indent=indent)
+
     # ───────────────────────────────
     # LOGGING & RECENT ACTIVITIES
     # ───────────────────────────────
     def log(self, message):
         if not self.debug_mode:
             return
+        if threading.current_thread() is not threading.main_thread():
+            # Worker threads hand log lines to the Tk thread, like every other callback.
+            self.tasks.call_soon(self.log, message)
+            return
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         log_message = f"{timestamp}: {message}\n"
         self.log_history.append(log_message)
@@ -218,43 +2428,88 @@ class SteamManagerApp:
         self.minimalist_mode = False
         self.exit_to_tray = True
         self.auto_dark_mode = False
+        self.scan_max_exes = 500
+        self.scan_max_seconds = 0
+        self.steam_exe = ""
         self.luma_toggled = False
         self.save_config(main_path=self.saved_main_path, extra_paths=self.saved_paths)
         self.initialize_main_window()
 
     def clear_cache(self):
         self.appid_cache = {}
+        self.appid_fetched = {}
+        self.app_details_dirty = True
+        self.save_app_details_cache()
+        self.icon_cache.clear()
+        with self.resolve_lock:
+            self.resolve_cache = {}
+        self.resolve_cache_dirty = True
+        self.save_resolve_cache()
+        shutil.rmtree(SCAN_STATE_DIR, ignore_errors=True)
+        self.disk_usage.clear()
+        self.name_lookups = {}
         self.log("Cache cleared.")
 
     # ───────────────────────────────
     # MISSING CSV IMPORT METHOD
     # ───────────────────────────────
-    def import_csv_library(self):
+    def import_csv_library(self, parent_win):
         filename = filedialog.askopenfilename(title="Import Library CSV", filetypes=[("CSV files", "*.csv")])
         if not filename:
             return
-        try:
-            with open(filename, "r", newline="", encoding="utf-8") as csvfile:
-                reader = csv.DictReader(csvfile)
-                imported = []
-                for row in reader:
-                    imported.append({
-                        "name": row.get("Name", ""),
-                        "path": row.get("Path", ""),
-                        "favorite": row.get("Favorite", "False").lower() == "true",
-                        "date_added": row.get("Date Added", datetime.now().isoformat())
-                    })
-            existing_paths = {item["path"] for item in self.library_items}
-            for item in imported:
-                if item.get("path") not in existing_paths:
-                    self.library_items.append(item)
-            self.update_library_display()
-            self.save_library()
-            messagebox.showinfo("Import", "Library imported successfully from CSV.")
-            self.log(f"Imported library from {filename} (CSV)")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to import library CSV: {str(e)}")
-            self.log(f"Error importing library CSV: {str(e)}")
+        task = CsvImport(filename)
+        progress = self.open_progress_window("Importing...", "Importing library CSV, please wait...", task.cancel)
+        self.log(f"Importing library from {filename} (CSV)")
+        task.start()
+        self.root.after(SCAN_POLL_MS, lambda: self.poll_csv_task(task, parent_win, progress, 0))
+
+    def poll_csv_task(self, task, parent_win, progress, total_added):
+        # Shared by CSV import and export: merges imported chunks through the library index
+        # (which also drops duplicates), updates the progress window and reports the outcome.
+        progress_win, progress_label, progress_bar = progress
+        finished = False
+        added = []
+        deadline = time.monotonic() + CSV_MERGE_BUDGET
+        while time.monotonic() < deadline:
+            try:
+                chunk = task.events.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is None:
+                finished = True
+                break
+            added.extend(self.library_items.add_many(chunk))
+        total_added += len(added)
+        if added:
+            self.mark_library_dirty()
+            self.show_new_library_items(added)
+        importing = isinstance(task, CsvImport)
+        if progress_win.winfo_exists():
+            if importing:
+                progress_label.configure(text=f"Rows read: {task.rows}\nGames added: {total_added}")
+            else:
+                progress_label.configure(text=f"Rows written: {task.done} of {task.total}")
+            if task.total:
+                progress_bar.set(task.done / task.total)
+        if not finished:
+            # Come straight back while chunks are waiting; the worker is blocked on a full queue.
+            delay = 1 if task.events.full() else SCAN_POLL_MS
+            self.root.after(delay, lambda: self.poll_csv_task(task, parent_win, progress, total_added))
+            return
+        if progress_win.winfo_exists():
+            progress_win.destroy()
+        if parent_win.winfo_exists():
+            parent_win.grab_set()
+        action = "import" if importing else "export"
+        if task.error is not None:
+            messagebox.showerror("Error", f"Failed to {action} library CSV: {str(task.error)}")
+            self.log(f"Error during library CSV {action}: {str(task.error)}")
+        elif task.cancelled.is_set():
+            self.log(f"Library CSV {action} cancelled ({total_added} games added)." if importing else "Library CSV export cancelled.")
+        elif importing:
+            self.log(f"Imported {total_added} games from {task.filename} ({task.rows} rows, CSV)")
+        else:
+            self.log(f"Library exported to {task.filename} ({task.total} games)")
 
     # ───────────────────────────────
     # SPLASH & ERROR WINDOWS
@@ -273,10 +2528,40 @@ class SteamManagerApp:
         if self.config_error:
             splash.withdraw()
             self.show_config_error()
-        elif not self.saved_main_path or not os.path.exists(os.path.join(self.saved_main_path, "steam.exe")):
-            self.root.after(2000, lambda: [splash.destroy(), self.firstboot()])
+            return
+        # Saved state loads on the task pool once the splash is up; the splash closes when it is in.
+        self.root.after_idle(lambda: self.tasks.submit(self.load_state, on_done=lambda _: self.finish_startup(splash),
+                                                       on_error=lambda e: self.finish_startup(splash, e)))
+
+    def load_state(self):
+        self.load_library()
+        self.load_resolve_cache()
+        self.load_health_cache()
+        self.load_app_details_cache()
+        self.disk_usage.load()
+
+    def finish_startup(self, splash, error=None):
+        if error is not None:
+            self.log(f"Error loading saved state: {str(error)}")
+        if splash.winfo_exists():
+            splash.destroy()
+        if not self.saved_main_path or not os.path.exists(os.path.join(self.saved_main_path, "steam.exe")):
+            self.firstboot()
         else:
-            self.root.after(500, lambda: [splash.destroy(), self.initialize_main_window()])
+            self.initialize_main_window()
+            if self.launch_command == "refresh-manifests":
+                self.manifest_adder()
+        self.root.after_idle(self.setup_tray_icon)
+        self.root.after_idle(self.start_background_work)
+
+    def start_background_work(self):
+        # Watchers and maintenance that have nothing to show before the first window: Steam
+        # supervision (which loads the win32 modules and lists processes) and the idle jobs.
+        self.steam.start()
+        self.idle_scheduler.add("app list refresh", self.refresh_app_list, budget=APP_LIST_FETCH_BUDGET)
+        self.idle_scheduler.add("metadata revalidation", self.revalidate_app_details)
+        self.idle_scheduler.add("library health check", self.recheck_library_health)
+        self.idle_scheduler.add("icon cache warm-up", self.warm_icon_cache)
 
     def show_config_error(self):
         error_win = ctk.CTkToplevel(self.root)
@@ -371,6 +2656,9 @@ class SteamManagerApp:
         self.sidebar_frame = ctk.CTkFrame(self.root, width=240, corner_radius=10)
         self.sidebar_frame.pack(side="left", fill="y", padx=10, pady=10)
         ctk.CTkLabel(self.sidebar_frame, text="Steam Control", font=("Helvetica", 16, "bold")).pack(pady=(10,5))
+        self.steam_status_label = ctk.CTkLabel(self.sidebar_frame, text="")
+        self.steam_status_label.pack()
+        self.update_steam_status()
         ctk.CTkButton(self.sidebar_frame, text="Open Steam", command=self.open_steam, width=200).pack(pady=2)
         ctk.CTkButton(self.sidebar_frame, text="Close Steam", command=self.close_steam, width=200).pack(pady=2)
         ctk.CTkLabel(self.sidebar_frame, text="Manifest Operations", font=("Helvetica", 16, "bold")).pack(pady=(10,5))
@@ -439,18 +2727,42 @@ class SteamManagerApp:
     # SYSTEM TRAY & EXIT BEHAVIOR
     # ───────────────────────────────
     def on_closing(self):
-        if self.exit_to_tray:
+        if self.exit_to_tray and self.tray_icon is not None:
             self.root.withdraw()
+            self.window_hidden = True
+            self.idle_scheduler.resume()
             self.log("Application minimized to system tray.")
         else:
+            self.flush_library()
+            self.save_resolve_cache()
+            self.save_app_details_cache()
+            self.tasks.shutdown()
+            if self.instance is not None:
+                self.instance.close()
             self.root.destroy()
 
     def show_window(self):
+        self.window_hidden = False
+        self.idle_scheduler.pause()
+        self.note_activity()
         self.root.deiconify()
         self.root.lift()
         self.log("Main window restored from system tray.")
 
+    def handle_instance_command(self, command):
+        # Another launch forwarded its command instead of starting a second copy.
+        self.log(f"Another launch requested '{command}'.")
+        self.show_window()
+        if command == "refresh-manifests":
+            self.manifest_adder()
+
     def exit_app(self):
+        self.flush_library()
+        self.save_resolve_cache()
+        self.save_app_details_cache()
+        self.tasks.shutdown()
+        if self.instance is not None:
+            self.instance.close()
         if self.tray_icon:
             self.tray_icon.stop()
         self.root.quit()
@@ -468,9 +2780,11 @@ class SteamManagerApp:
             return
         icon_image = self.create_tray_icon_image()
         menu = pystray.Menu(
-            pystray.MenuItem("Open Steam", lambda _: self.root.after(0, self.open_steam)),
-            pystray.MenuItem("Show", lambda _: self.root.after(0, self.show_window)),
-            pystray.MenuItem("Exit", lambda _: self.root.after(0, self.exit_app))
+            pystray.MenuItem(lambda _: f"Steam: {'Running' if self.steam.running else 'Stopped'}", None, enabled=False),
+            pystray.MenuItem("Open Steam", lambda _: self.tasks.call_soon(self.open_steam), visible=lambda _: not self.steam.running),
+            pystray.MenuItem("Close Steam", lambda _: self.tasks.call_soon(self.close_steam), visible=lambda _: self.steam.running),
+            pystray.MenuItem("Show", lambda _: self.tasks.call_soon(self.show_window)),
+            pystray.MenuItem("Exit", lambda _: self.tasks.call_soon(self.exit_app))
         )
         self.tray_icon = pystray.Icon("SteamManager", icon_image, "Steam Manager", menu)
         self.tray_thread = threading.Thread(target=self.tray_icon.run, daemon=True)
@@ -480,40 +2794,45 @@ class SteamManagerApp:
     # FUNCTIONALITY METHODS
     # ───────────────────────────────
     def open_steam(self):
-        if os.name != "nt":
-            messagebox.showerror("Error", "Opening Steam is supported only on Windows.")
-            return
-        if self.saved_main_path:
-            steam_exe = os.path.join(self.saved_main_path, "steam.exe")
-            if os.path.exists(steam_exe):
-                try:
-                    os.startfile(steam_exe)
-                    appcache = os.path.join(self.saved_main_path, "DeleteSteamAppCache.exe")
-                    if os.path.exists(appcache):
-                        p = subprocess.Popen([appcache])
-                        time.sleep(1)
-                        p.kill()
-                    self.log("Steam opened and DeleteSteamAppCache.exe executed.")
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to open Steam: {str(e)}")
-                    self.log(f"Error opening Steam: {str(e)}")
-            else:
-                messagebox.showerror("Error", "Steam executable not found in the saved path.")
-                self.log("Steam executable not found.")
-        else:
+        steam_exe = self.steam_exe_path()
+        if not steam_exe:
             messagebox.showerror("Error", "Main Steam path is not set.")
             self.log("Attempted to open Steam without a valid main path.")
+            return
+        if not os.path.exists(steam_exe):
+            messagebox.showerror("Error", "Steam executable not found in the saved path.")
+            self.log("Steam executable not found.")
+            return
+        helper = os.path.join(os.path.dirname(steam_exe), "DeleteSteamAppCache.exe")
+        self.tasks.submit(self.steam.launch, helper,
+                          on_done=lambda started: self.log("Steam opened and DeleteSteamAppCache.exe executed."
+                                                           if started else "Steam is already running."),
+                          on_error=self.error_reporter("Failed to open Steam", "Error opening Steam"))
 
     def close_steam(self):
-        if os.name != "nt":
-            messagebox.showerror("Error", "Closing Steam is supported only on Windows.")
-            return
-        try:
-            os.system("taskkill /f /im steam.exe")
-            self.log("Steam closed.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to close Steam: {str(e)}")
-            self.log(f"Error closing Steam: {str(e)}")
+        self.tasks.submit(self.steam.terminate,
+                          on_done=lambda stopped: self.log("Steam closed." if stopped else "Steam is not running."),
+                          on_error=self.error_reporter("Failed to close Steam", "Error closing Steam"))
+
+    def steam_exe_path(self):
+        if self.steam_exe:
+            return self.steam_exe
+        return os.path.join(self.saved_main_path, "steam.exe") if self.saved_main_path else None
+
+    def update_steam_status(self):
+        running = self.steam.running
+        if self.steam_status_label is not None and self.steam_status_label.winfo_exists():
+            self.steam_status_label.configure(text=f"Steam: {'Running' if running else 'Stopped'}",
+                                              text_color="green" if running else "gray")
+        if self.tray_icon is not None:
+            self.tray_icon.update_menu()
+
+    def error_reporter(self, message, log_prefix):
+        # on_error callback for tasks: the usual error dialog plus a log line.
+        def report(e):
+            messagebox.showerror("Error", f"{message}: {str(e)}")
+            self.log(f"{log_prefix}: {str(e)}")
+        return report
 
     def set_luma_state(self, desired_state):
         if not self.saved_main_path:
@@ -575,16 +2894,17 @@ class SteamManagerApp:
                 return
         total_files = 0
         file_counter = 1
+        appids = []
         main_steamapps = os.path.join(self.saved_main_path, "steamapps")
         if os.path.exists(main_steamapps):
             initial_counter = file_counter
-            file_counter = self.process_manifest_files(main_steamapps, output_folder, file_counter)
+            file_counter = self.process_manifest_files(main_steamapps, output_folder, file_counter, appids)
             total_files += (file_counter - initial_counter)
         for path in self.saved_paths:
             steamapps_path = os.path.join(path, "steamapps")
             if os.path.exists(steamapps_path):
                 initial_counter = file_counter
-                file_counter = self.process_manifest_files(steamapps_path, output_folder, file_counter)
+                file_counter = self.process_manifest_files(steamapps_path, output_folder, file_counter, appids)
                 total_files += (file_counter - initial_counter)
             else:
                 messagebox.showwarning("Warning", f"Skipping invalid path: {path} (steamapps not found)")
@@ -600,24 +2920,31 @@ class SteamManagerApp:
             return
         messagebox.showinfo("Success", f"Successfully added {total_files} games to the manifest list.")
         self.log(f"Manifest refresh completed: {total_files} games added.")
+        self.prefetcher.add(appids)
 
-    def process_manifest_files(self, manifest_dir, output_folder, file_counter):
-        for item in os.listdir(manifest_dir):
-            item_path = os.path.join(manifest_dir, item)
-            if os.path.isfile(item_path):
-                match = re.match(r"appmanifest_(\d+)\.acf", item)
-                if match:
-                    appid = match.group(1)
-                    output_file = os.path.join(output_folder, f"{file_counter}.txt")
-                    try:
-                        with open(output_file, "w") as f:
-                            f.write(f"{appid}\n")
-                        file_counter += 1
-                    except Exception as e:
-                        messagebox.showerror("Error", f"Failed to write {output_file}: {str(e)}")
-                        self.log(f"Error writing manifest file {output_file}: {str(e)}")
+    def process_manifest_files(self, manifest_dir, output_folder, file_counter, appids=None):
+        for appid, _ in find_app_manifests(manifest_dir):
+            if appids is not None:
+                appids.append(appid)
+            output_file = os.path.join(output_folder, f"{file_counter}.txt")
+            try:
+                with open(output_file, "w") as f:
+                    f.write(f"{appid}\n")
+                file_counter += 1
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to write {output_file}: {str(e)}")
+                self.log(f"Error writing manifest file {output_file}: {str(e)}")
         return file_counter
 
+    def steamapps_folders(self):
+        # steamapps of the main Steam folder and of each additional library folder that has one.
+        folders = []
+        for path in ([self.saved_main_path] if self.saved_main_path else []) + self.saved_paths:
+            steamapps_path = os.path.join(path, "steamapps")
+            if os.path.isdir(steamapps_path):
+                folders.append(steamapps_path)
+        return folders
+
     def open_manifest_folder(self):
         if not self.saved_main_path:
             messagebox.showerror("Error", "Main Steam path is not set.")
@@ -648,18 +2975,25 @@ class SteamManagerApp:
         games_win.title("Installed Games")
         games_win.geometry("600x500")
         games_win.grab_set()
-        self.games_scroll_frame = ctk.CTkScrollableFrame(games_win, width=580, height=400)
-        self.games_scroll_frame.pack(pady=10, padx=10)
-        self.populate_installed_games(self.games_scroll_frame, output_folder)
+        sort_frame = ctk.CTkFrame(games_win)
+        sort_frame.pack(pady=(10, 0), padx=10, fill="x")
+        ctk.CTkLabel(sort_frame, text="Sort By:").pack(side="left")
+        sort_option = ctk.CTkOptionMenu(sort_frame, values=["Manifest Order", "Size (Largest)"],
+                                        command=self.set_installed_sort)
+        sort_option.set("Size (Largest)" if self.installed_sort_method == "size" else "Manifest Order")
+        sort_option.pack(side="left", padx=5)
+        self.games_list = VirtualList(games_win, row_height=46, create_row=self.create_installed_game_row,
+                                      bind_row=self.bind_installed_game_row, width=580, height=400)
+        self.games_list.pack(pady=10, padx=10, fill="both", expand=True)
+        self.populate_installed_games(self.games_list, output_folder)
 
-    def populate_installed_games(self, scroll_frame, output_folder):
-        for widget in scroll_frame.winfo_children():
-            widget.destroy()
+    def populate_installed_games(self, games_list, output_folder):
+        self.tasks.submit(self.read_installed_games, output_folder, key="installed games",
+                          on_done=lambda result: self.show_installed_games(games_list, *result))
+
+    def read_installed_games(self, output_folder):
         files = [f for f in os.listdir(output_folder) if f.endswith(".txt") and f != "0.txt"]
-        if not files:
-            ctk.CTkLabel(scroll_frame, text="No games found in the manifest list.", font=("Helvetica", 12)).pack(pady=10)
-            self.log("View Installed Games: no games found.")
-            return
+        entries = []
         for file in files:
             file_path = os.path.join(output_folder, file)
             try:
@@ -668,16 +3002,95 @@ class SteamManagerApp:
             except Exception as e:
                 appid = "Error reading file"
                 self.log(f"Error reading {file_path}: {str(e)}")
-            game_name = self.get_game_name(appid)
-            frame = ctk.CTkFrame(scroll_frame)
-            frame.pack(fill="x", pady=5, padx=5)
-            ctk.CTkLabel(frame, text=f"AppID: {appid} - {game_name}", font=("Helvetica", 12)).grid(row=0, column=0, sticky="w", padx=(5,10))
-            ctk.CTkButton(frame, text="Open Store", command=lambda a=appid: self.open_store(a), width=90).grid(row=0, column=1, padx=5)
-            ctk.CTkButton(frame, text="Details", command=lambda a=appid: self.show_game_details(a), width=90).grid(row=0, column=2, padx=5)
-            ctk.CTkButton(frame, text="Remove", command=lambda fp=file_path: self.remove_manifest_file(fp), width=90).grid(row=0, column=3, padx=5)
-            frame.grid_columnconfigure(0, weight=1)
+            entries.append((file_path, appid))
+        manifests = {}
+        for steamapps_path in self.steamapps_folders():
+            try:
+                manifests.update(find_app_manifests(steamapps_path))
+            except OSError as e:
+                self.log(f"Error listing {steamapps_path}: {str(e)}")
+        return entries, manifests
+
+    def show_installed_games(self, games_list, entries, manifests):
+        if not games_list.winfo_exists():
+            return
+        self.installed_manifests = manifests
+        if self.installed_sort_method == "size":
+            entries.sort(key=lambda entry: self.installed_game_size(entry[1]) or -1, reverse=True)
+        games_list.set_items(entries, keep_position=True, empty_text="No games found in the manifest list.")
+        self.prefetcher.add(appid for _, appid in reversed(entries))  # Rows at the top first
+        if not entries:
+            self.log("View Installed Games: no games found.")
+            return
         self.log("Displayed installed games.")
 
+    def create_installed_game_row(self, parent):
+        row = ctk.CTkFrame(parent)
+        row.label = ctk.CTkLabel(row, text="", font=("Helvetica", 12), anchor="w")
+        row.label.grid(row=0, column=0, sticky="w", padx=(5,10))
+        row.store_btn = ctk.CTkButton(row, text="Open Store", width=90)
+        row.store_btn.grid(row=0, column=1, padx=5)
+        row.details_btn = ctk.CTkButton(row, text="Details", width=90)
+        row.details_btn.grid(row=0, column=2, padx=5)
+        row.remove_btn = ctk.CTkButton(row, text="Remove", width=90)
+        row.remove_btn.grid(row=0, column=3, padx=5)
+        row.grid_columnconfigure(0, weight=1)
+        row.grid_rowconfigure(0, weight=1)
+        return row
+
+    def bind_installed_game_row(self, row, entry):
+        file_path, appid = entry
+        size = self.installed_game_size(appid)
+        size_text = f" ({format_size(size)})" if size is not None else ""
+        row.label.configure(text=f"AppID: {appid} - {self.installed_game_name(appid)}{size_text}")
+        row.store_btn.configure(command=lambda: self.open_store(appid))
+        row.details_btn.configure(command=lambda: self.show_game_details(appid))
+        row.remove_btn.configure(command=lambda: self.remove_manifest_file(file_path))
+
+    def installed_game_name(self, appid):
+        # Cached names only; a miss is fetched on the task pool and its row re-bound when it arrives.
+        details = self.appid_cache.get(appid)
+        if details is not None:
+            return details.get("name", "Unknown")
+        lookup = self.name_lookups.get(appid)
+        if lookup is None:
+            self.name_lookups[appid] = self.tasks.submit(self.get_app_details, appid,
+                                                         on_done=lambda _: self.on_game_name_ready(appid))
+            return "Loading..."
+        return "Unknown" if lookup.done() else "Loading..."
+
+    def on_game_name_ready(self, appid):
+        if self.games_list is not None and self.games_list.winfo_exists():
+            self.games_list.refresh(lambda entry: entry[1] == appid)
+
+    def installed_game_size(self, appid):
+        manifest_path = self.installed_manifests.get(appid)
+        return self.disk_usage.get(manifest_path) if manifest_path else None
+
+    def set_installed_sort(self, value):
+        self.installed_sort_method = "size" if value == "Size (Largest)" else "manifest"
+        self.refresh_installed_games()
+
+    def on_size_ready(self, path):
+        key = library_path_key(path)
+        if self.games_list is not None and self.games_list.winfo_exists():
+            self.games_list.refresh(lambda entry: entry[1] in self.installed_manifests
+                                    and library_path_key(self.installed_manifests[entry[1]]) == key)
+        if self.library_list is not None and self.library_list.winfo_exists():
+            def sized_from(item):
+                root = self.library_size_root(item)
+                return root is not None and library_path_key(root) == key
+            self.library_list.refresh(sized_from)
+        if (self.installed_sort_method == "size" or self.library_sort_method == "size") and self.size_resort_job is None:
+            self.size_resort_job = self.root.after(SIZE_RESORT_DELAY_MS, self.resort_by_size)
+
+    def resort_by_size(self):
+        self.size_resort_job = None
+        if self.installed_sort_method == "size":
+            self.refresh_installed_games()
+        if self.library_sort_method == "size":
+            self.update_library_display()
+
     def remove_manifest_file(self, file_path):
         if messagebox.askyesno("Confirm Remove", f"Are you sure you want to remove manifest file '{os.path.basename(file_path)}'?"):
             try:
@@ -690,9 +3103,9 @@ class SteamManagerApp:
                 self.log(f"Error removing manifest file {file_path}: {str(e)}")
 
     def refresh_installed_games(self):
-        if self.games_scroll_frame and self.saved_main_path:
+        if self.games_list and self.games_list.winfo_exists() and self.saved_main_path:
             output_folder = os.path.join(self.saved_main_path, "applist")
-            self.populate_installed_games(self.games_scroll_frame, output_folder)
+            self.populate_installed_games(self.games_list, output_folder)
 
     def open_store(self, appid):
         url = f"https://store.steampowered.com/app/{appid}"
@@ -700,7 +3113,10 @@ class SteamManagerApp:
         self.log(f"Opened store page for AppID {appid}.")
 
     def show_game_details(self, appid):
-        details = self.get_app_details(appid)
+        self.tasks.submit(self.get_app_details, appid, key="game details",
+                          on_done=lambda details: self.open_game_details(details))
+
+    def open_game_details(self, details):
         if not details:
             messagebox.showerror("Error", "Unable to fetch game details.")
             return
@@ -736,75 +3152,122 @@ class SteamManagerApp:
         search_win.grab_set()
         search_entry = ctk.CTkEntry(search_win, placeholder_text="Enter game name")
         search_entry.pack(pady=10, padx=10, fill="x")
-        results_frame = ctk.CTkScrollableFrame(search_win, height=400)
-        results_frame.pack(pady=10, padx=10, fill="both", expand=True)
-        ctk.CTkButton(search_win, text="Search", command=lambda: self.perform_search(search_entry.get(), results_frame)).pack(pady=5)
+        self.search_results_list = VirtualList(search_win, row_height=62, create_row=self.create_search_result_row,
+                                               bind_row=self.bind_search_result_row, height=400)
+        self.search_results_list.pack(pady=10, padx=10, fill="both", expand=True)
+        self.search_detail_box = ctk.CTkTextbox(search_win, height=80, wrap="word", state="disabled")
+        self.search_detail_box.pack(padx=10, fill="x")
+        self.search_expanded_appid = None
+        ctk.CTkButton(search_win, text="Search", command=lambda: self.perform_search(search_entry.get(), self.search_results_list)).pack(pady=5)
 
-    def perform_search(self, query, results_frame):
+    def perform_search(self, query, results_list):
         if not query:
             messagebox.showerror("Error", "Please enter a game name to search.")
             return
         query_lower = query.lower()
         self.log(f"Searching for query: '{query_lower}'")
+        self.tasks.submit(self.search_app_list, query, key="search",
+                          on_done=lambda matches: self.show_search_results(matches, results_list),
+                          on_error=self.error_reporter("Failed to fetch app list", "Error fetching app list"))
+
+    def search_app_list(self, query):
         if not self.full_app_list:
-            try:
-                r = requests.get("https://api.steampowered.com/ISteamApps/GetAppList/v2/", timeout=10)
-                self.full_app_list = r.json()
+            self.load_app_list()
+        with self.app_matcher_lock:
+            if self.full_app_list and self.full_app_list_lower is None:
                 apps = self.full_app_list.get("applist", {}).get("apps", [])
-                self.log(f"Fetched app list with {len(apps)} apps.")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to fetch app list: {str(e)}")
-                return
-        if self.full_app_list and self.full_app_list_lower is None:
-            apps = self.full_app_list.get("applist", {}).get("apps", [])
-            self.full_app_list_lower = [(str(app["appid"]), app["name"].lower(), app) for app in apps if "name" in app]
-        matches = [tup[2] for tup in self.full_app_list_lower if query_lower in tup[1]]
+                self.full_app_list_lower = [(str(app["appid"]), app["name"].lower(), app) for app in apps if "name" in app]
+            app_list_lower = self.full_app_list_lower or []
+        query_lower = query.lower()
+        matches = [tup[2] for tup in app_list_lower if query_lower in tup[1]]
         self.log(f"Found {len(matches)} matches for query '{query}'.")
-        matches = sorted(matches, key=lambda x: x["name"])[:20]
-        for widget in results_frame.winfo_children():
-            widget.destroy()
-        if not matches:
-            ctk.CTkLabel(results_frame, text="No games found.", font=("Helvetica", 12)).pack(pady=10)
+        return sorted(matches, key=lambda x: x["name"])[:SEARCH_RESULT_LIMIT]
+
+    def show_search_results(self, matches, results_list):
+        if not results_list.winfo_exists():
             return
-        for app in matches:
-            appid = str(app["appid"])
-            name = app["name"]
-            result_frame = ctk.CTkFrame(results_frame)
-            result_frame.pack(fill="x", pady=5, padx=5)
-            header_image_url = self.get_app_details(appid).get("header_image", None)
-            if header_image_url:
-                try:
-                    image_data = requests.get(header_image_url, timeout=5).content
-                    pil_image = Image.open(BytesIO(image_data))
-                    pil_image = pil_image.resize((80, 45))
-                    ct_image = ctk.CTkImage(light_image=pil_image, dark_image=pil_image, size=(80,45))
-                    image_label = ctk.CTkLabel(result_frame, image=ct_image, text="")
-                    image_label.image = ct_image
-                    image_label.grid(row=0, column=0, rowspan=2, padx=5, pady=5)
-                except Exception:
-                    ctk.CTkLabel(result_frame, text="No Image").grid(row=0, column=0, rowspan=2, padx=5, pady=5)
-            else:
-                ctk.CTkLabel(result_frame, text="No Image").grid(row=0, column=0, rowspan=2, padx=5, pady=5)
-            ctk.CTkLabel(result_frame, text=name, font=("Helvetica", 14), anchor="w").grid(row=0, column=1, sticky="w")
-            toggle_btn = ctk.CTkButton(result_frame, text="▼", width=30)
-            toggle_btn.grid(row=0, column=2, padx=5)
-            ctk.CTkButton(result_frame, text="Add to Manifest", command=lambda a=appid: self.add_game_to_manifest(a), width=120).grid(row=0, column=3, padx=5)
-            result_frame.grid_columnconfigure(1, weight=1)
-            def toggle_desc(btn=toggle_btn, appid=appid, parent=result_frame):
-                if not hasattr(btn, "desc_label"):
-                    details = self.get_app_details(appid)
-                    desc_text = details.get("short_description", "No description available")
-                    desc_label = ctk.CTkLabel(parent, text=desc_text, font=("Helvetica", 10), anchor="w", wraplength=200)
-                    desc_label.grid(row=1, column=1, columnspan=3, sticky="w", padx=5, pady=5)
-                    btn.desc_label = desc_label
-                    btn.configure(text="▲")
-                else:
-                    btn.desc_label.destroy()
-                    del btn.desc_label
-                    btn.configure(text="▼")
-            toggle_btn.configure(command=toggle_desc)
+        self.search_expanded_appid = None
+        self.show_search_description(None)
+        results_list.set_items(matches, empty_text="No games found.")
         self.log("Search complete; results displayed.")
 
+    def create_search_result_row(self, parent):
+        row = ctk.CTkFrame(parent)
+        row.image_label = ctk.CTkLabel(row, text="No Image", width=80, height=45)
+        row.image_label.grid(row=0, column=0, padx=5, pady=5)
+        row.name_label = ctk.CTkLabel(row, text="", font=("Helvetica", 14), anchor="w")
+        row.name_label.grid(row=0, column=1, sticky="w")
+        row.toggle_btn = ctk.CTkButton(row, text="▼", width=30)
+        row.toggle_btn.grid(row=0, column=2, padx=5)
+        row.add_btn = ctk.CTkButton(row, text="Add to Manifest", width=120)
+        row.add_btn.grid(row=0, column=3, padx=5)
+        row.grid_columnconfigure(1, weight=1)
+        return row
+
+    def bind_search_result_row(self, row, app):
+        appid = str(app["appid"])
+        header_image = self.get_header_image(appid)
+        if header_image:
+            ct_image = ctk.CTkImage(light_image=header_image, dark_image=header_image, size=(80,45))
+            row.image_label.configure(image=ct_image, text="")
+            row.image_label.image = ct_image
+        else:
+            row.image_label.configure(image=None, text="No Image")
+        row.name_label.configure(text=app["name"])
+        row.toggle_btn.configure(text="▲" if appid == self.search_expanded_appid else "▼",
+                                 command=lambda: self.toggle_search_description(appid))
+        row.add_btn.configure(command=lambda: self.add_game_to_manifest(appid))
+
+    def toggle_search_description(self, appid):
+        if appid == self.search_expanded_appid:
+            self.search_expanded_appid = None
+            self.show_search_description(None)
+        else:
+            self.search_expanded_appid = appid
+            self.show_search_description("Loading...")
+            self.tasks.submit(self.get_app_details, appid, key="search description",
+                              on_done=lambda details: self.on_search_description_ready(appid, details))
+        self.search_results_list.refresh()
+
+    def on_search_description_ready(self, appid, details):
+        if appid == self.search_expanded_appid and self.search_detail_box.winfo_exists():
+            self.show_search_description(details.get("short_description", "No description available"))
+
+    def show_search_description(self, text):
+        self.search_detail_box.configure(state="normal")
+        self.search_detail_box.delete("0.0", "end")
+        if text:
+            self.search_detail_box.insert("0.0", text)
+        self.search_detail_box.configure(state="disabled")
+
+    def get_header_image(self, appid):
+        # Header thumbnails are cached per appid (None included) so re-binding a row never refetches.
+        # Misses are fetched on the task pool and the row is re-bound once the image arrives.
+        if appid in self.header_image_cache:
+            return self.header_image_cache[appid]
+        if appid not in self.header_image_pending:
+            self.header_image_pending.add(appid)
+            self.tasks.submit(self.fetch_header_image, appid,
+                              on_done=lambda image: self.on_header_image_ready(appid, image),
+                              on_error=lambda e: self.header_image_pending.discard(appid))
+        return None
+
+    def fetch_header_image(self, appid):
+        header_image_url = self.get_app_details(appid).get("header_image", None)
+        if not header_image_url:
+            return None
+        try:
+            image_data = requests.get(header_image_url, timeout=5).content
+            return Image.open(BytesIO(image_data)).resize((80, 45))
+        except Exception:
+            return None
+
+    def on_header_image_ready(self, appid, image):
+        self.header_image_pending.discard(appid)
+        self.header_image_cache[appid] = image
+        if self.search_results_list is not None and self.search_results_list.winfo_exists():
+            self.search_results_list.refresh(lambda app: str(app["appid"]) == appid)
+
     def add_game_to_manifest(self, appid):
         if not self.saved_main_path:
             messagebox.showerror("Error", "Main Steam path is not set.")
@@ -850,27 +3313,40 @@ class SteamManagerApp:
         btn_scan.pack(side="left", padx=5)
         btn_manual = ctk.CTkButton(controls_frame, text="Manual Add", command=self.manual_add_game)
         btn_manual.pack(side="left", padx=5)
+        btn_steam = ctk.CTkButton(controls_frame, text="Import Steam Games",
+                                  command=lambda: self.import_steam_games(btn_steam))
+        btn_steam.pack(side="left", padx=5)
+        health_frame = ctk.CTkFrame(lib_win)
+        health_frame.pack(pady=5, padx=10, fill="x")
+        self.library_health_btn = ctk.CTkButton(health_frame, text="Check Health", command=self.toggle_health_check)
+        self.library_health_btn.pack(side="left", padx=5)
+        self.library_prune_btn = ctk.CTkButton(health_frame, text="Remove Missing", command=self.prune_missing_library_items)
+        self.library_prune_btn.pack(side="left", padx=5)
+        self.update_health_buttons()
         sort_frame = ctk.CTkFrame(lib_win)
         sort_frame.pack(pady=5, padx=10, fill="x")
         ctk.CTkLabel(sort_frame, text="Sort By:").pack(side="left")
-        sort_option = ctk.CTkOptionMenu(sort_frame, values=["Name (A-Z)", "Date Added (Newest)"],
+        sort_option = ctk.CTkOptionMenu(sort_frame, values=["Name (A-Z)", "Date Added (Newest)", "Size (Largest)"],
                                          command=lambda val: self.set_library_sort(val))
         sort_option.set("Name (A-Z)")
         sort_option.pack(side="left", padx=5)
         filter_frame = ctk.CTkFrame(lib_win)
         filter_frame.pack(pady=5, padx=10, fill="x")
         ctk.CTkLabel(filter_frame, text="Filter Library:").pack(side="left")
-        filter_entry = ctk.CTkEntry(filter_frame, placeholder_text="Enter text to filter", width=200)
+        filter_entry = ctk.CTkEntry(filter_frame, placeholder_text="e.g. fav:yes drive:D witcher added:>2024-01", width=280)
         filter_entry.pack(side="left", padx=5)
+        self.library_filter_text = ""
         filter_entry.bind("<KeyRelease>", lambda event: self.update_library_display(filter_text=filter_entry.get()))
         toggle_fav_btn = ctk.CTkButton(filter_frame, text="Show Favorites Only", command=self.toggle_favorites_filter)
         toggle_fav_btn.pack(side="left", padx=5)
-        export_btn = ctk.CTkButton(filter_frame, text="Export Library (CSV)", command=self.export_library)
+        export_btn = ctk.CTkButton(filter_frame, text="Export Library (CSV)", command=lambda: self.export_library(lib_win))
         export_btn.pack(side="left", padx=5)
-        import_csv_btn = ctk.CTkButton(filter_frame, text="Import CSV Library", command=self.import_csv_library)
+        import_csv_btn = ctk.CTkButton(filter_frame, text="Import CSV Library", command=lambda: self.import_csv_library(lib_win))
         import_csv_btn.pack(side="left", padx=5)
-        self.library_frame = ctk.CTkScrollableFrame(lib_win, height=400)
-        self.library_frame.pack(pady=10, padx=10, fill="both", expand=True)
+        self.library_list = VirtualList(lib_win, row_height=84, create_row=self.create_library_row,
+                                        bind_row=self.bind_library_row, key=lambda item: library_path_key(item.path),
+                                        height=400)
+        self.library_list.pack(pady=10, padx=10, fill="both", expand=True)
         self.update_library_display()
 
     def set_library_sort(self, value):
@@ -878,99 +3354,326 @@ class SteamManagerApp:
             self.library_sort_method = "name"
         elif value == "Date Added (Newest)":
             self.library_sort_method = "date"
+        elif value == "Size (Largest)":
+            self.library_sort_method = "size"
         self.update_library_display()
 
     def scan_folder_for_games(self, parent_win):
         folder = filedialog.askdirectory(title="Select folder to scan for games")
         if not folder:
             return
-        exe_count = 0
+        scan = FolderScan(folder, lambda path: path in self.library_items, self.resolve_exe_name,
+                          max_exes=self.scan_max_exes, max_seconds=self.scan_max_seconds,
+                          checkpoint_path=self.scan_checkpoint_path(folder))
+        progress_win, progress_label, progress_bar = self.open_progress_window(
+            "Scanning...", "Scanning folder, please wait...", scan.cancel)
+        self.log(f"Scanning {folder} for games.")
+        scan.start()
+        self.root.after(SCAN_POLL_MS, lambda: self.poll_folder_scan(scan, parent_win, progress_win, progress_label, progress_bar, 0))
+
+    def scan_checkpoint_path(self, folder):
+        name = hashlib.sha1(library_path_key(os.path.abspath(folder)).encode("utf-8")).hexdigest()
+        return os.path.join(SCAN_STATE_DIR, f"{name}.json")
+
+    def open_progress_window(self, title, text, on_cancel):
         progress_win = ctk.CTkToplevel(self.root)
-        progress_win.title("Scanning...")
-        progress_label = ctk.CTkLabel(progress_win, text="Scanning folder, please wait...")
+        progress_win.title(title)
+        progress_win.grab_set()
+        progress_label = ctk.CTkLabel(progress_win, text=text)
         progress_label.pack(padx=20, pady=20)
-        progress_bar = ctk.CTkProgressBar(progress_win)
+        progress_bar = ctk.CTkProgressBar(progress_win, mode="determinate")
+        progress_bar.set(0)
         progress_bar.pack(padx=20, pady=10)
-        progress_bar.start()
-        self.root.update_idletasks()
-        for root_dir, dirs, files in os.walk(folder):
-            for file in files:
-                if file.lower().endswith(".exe"):
-                    if exe_count >= 500:
-                        break
-                    full_path = os.path.join(root_dir, file)
-                    base_name = os.path.splitext(file)[0]
-                    query = self.clean_exe_name(base_name)
-                    if not any(item["path"] == full_path for item in self.library_items):
-                        details = self.search_game_by_exe(query)
-                        name = details.get("name", query) if details else query
-                        self.library_items.append({
-                            "path": full_path,
-                            "name": name,
-                            "favorite": False,
-                            "date_added": datetime.now().isoformat()
-                        })
-                        exe_count += 1
-            if exe_count >= 500:
+        cancel_btn = ctk.CTkButton(progress_win, text="Cancel", command=lambda: [on_cancel(), cancel_btn.configure(state="disabled", text="Cancelling...")])
+        cancel_btn.pack(pady=(0, 15))
+        progress_win.protocol("WM_DELETE_WINDOW", on_cancel)
+        return progress_win, progress_label, progress_bar
+
+    def poll_folder_scan(self, scan, parent_win, progress_win, progress_label, progress_bar, total_added):
+        finished = False
+        added = []
+        while True:
+            try:
+                batch = scan.events.get_nowait()
+            except queue.Empty:
                 break
-        progress_bar.stop()
-        progress_win.destroy()
-        self.update_library_display()
-        self.save_library()
+            if batch is None:
+                finished = True
+                break
+            added.extend(self.library_items.add_many(batch))
+        total_added += len(added)
+        if added:
+            self.mark_library_dirty()
+            self.show_new_library_items(added)
+        if progress_win.winfo_exists():
+            resumed = " (resumed)" if scan.resumed else ""
+            progress_label.configure(text=f"Directories visited{resumed}: {scan.dirs_visited}\n"
+                                          f"Unchanged since last scan: {scan.dirs_unchanged}\n"
+                                          f"Executables found: {scan.exes_found}\n"
+                                          f"Skipped (not games): {scan.exes_skipped}\n"
+                                          f"Lookups pending: {scan.lookups_pending}"
+                                          + (f"\nErrors: {len(scan.errors)}" if scan.errors else ""))
+            if scan.exes_found:
+                progress_bar.set(scan.resolved / scan.exes_found)
+        if not finished:
+            self.root.after(SCAN_POLL_MS, lambda: self.poll_folder_scan(scan, parent_win, progress_win, progress_label, progress_bar, total_added))
+            return
+        if progress_win.winfo_exists():
+            progress_win.destroy()
+        if parent_win.winfo_exists():
+            parent_win.grab_set()
+        self.save_resolve_cache()
+        reason = f" ({scan.stop_reason}; the next scan of this folder resumes here)" if scan.stop_reason else ""
+        resumed = "Resumed folder scan" if scan.resumed else "Folder scan"
+        self.log(f"{resumed} finished: {total_added} games added from {scan.dirs_visited} directories, "
+                 f"{scan.dirs_unchanged} unchanged skipped{reason}.")
+        if scan.errors:
+            self.log(f"Folder scan hit {len(scan.errors)} error(s), retried by the next scan of this folder. "
+                     f"First: {scan.errors[0]}")
+
+    def resolve_exe_name(self, exe_path):
+        base_name = os.path.splitext(os.path.basename(exe_path))[0]
+        query = self.clean_exe_name(base_name)
+        if not query:
+            return base_name
+        match = self.lookup_exe_query(query)
+        return match["name"] if match else query
+
+    def lookup_exe_query(self, query):
+        # Safe to call from the resolver pool: each cleaned name is looked up at most once,
+        # concurrent callers for the same name wait for the first one, and "no match" is cached too.
+        with self.resolve_lock:
+            if query in self.resolve_cache:
+                return self.resolve_cache[query]
+            waiter = self.resolve_inflight.get(query)
+            if waiter is None:
+                self.resolve_inflight[query] = threading.Event()
+        if waiter is not None:
+            waiter.wait()
+            return self.resolve_cache.get(query)
+        match = None
+        try:
+            match = self.match_exe_offline(query)
+            if match is None:
+                match = self.search_game_by_exe(query)
+            with self.resolve_lock:
+                self.resolve_cache[query] = match
+                self.resolve_cache_dirty = True
+            if match:
+                self.prefetcher.add([match["appid"]])
+        except Exception as e:
+            # Network errors are not cached; the next scan retries the name.
+            self.log(f"Search by exe failed for '{query}': {str(e)}")
+        finally:
+            with self.resolve_lock:
+                self.resolve_inflight.pop(query).set()
+        return match
+
+    def import_steam_games(self, button):
+        # Installed Steam games straight from their appmanifest: name and install folder are
+        # recorded there, so there is no folder walk and no name lookup.
+        folders = self.steamapps_folders()
+        if not folders:
+            messagebox.showerror("Error", "No steamapps folder found. Set the main Steam path first.")
+            return
+        button.configure(state="disabled", text="Importing...")
+        self.log("Importing installed Steam games from app manifests.")
+        self.tasks.submit(self.collect_steam_games, folders,
+                          on_done=lambda result: self.finish_steam_import(*result, button))
+
+    def collect_steam_games(self, folders):
+        items = []
+        appids = []
+        missing = 0
+        for steamapps_path in folders:
+            try:
+                manifests = find_app_manifests(steamapps_path)
+            except OSError as e:
+                self.log(f"Error listing {steamapps_path}: {str(e)}")
+                continue
+            for appid, manifest_path in manifests:
+                try:
+                    manifest = read_app_manifest(manifest_path)
+                except OSError as e:
+                    self.log(f"Error reading {manifest_path}: {str(e)}")
+                    continue
+                installdir = manifest.get("installdir")
+                name = manifest.get("name") or f"AppID {appid}"
+                install_path = os.path.join(steamapps_path, "common", installdir) if installdir else None
+                if not install_path or not os.path.isdir(install_path):
+                    missing += 1
+                    continue
+                exe_path = primary_game_exe(install_path, name)
+                if exe_path is None:
+                    missing += 1
+                    continue
+                items.append(LibraryItem(exe_path, name))
+                appids.append(appid)
+        self.prefetcher.add(appids)
+        return items, missing
+
+    def finish_steam_import(self, items, missing, button):
+        added = self.library_items.add_many(items)
+        if added:
+            self.mark_library_dirty()
+            self.show_new_library_items(added)
+        if button.winfo_exists():
+            button.configure(state="normal", text="Import Steam Games")
+        self.log(f"Imported {len(added)} Steam games ({len(items) - len(added)} already in the library, "
+                 f"{missing} without an install folder or executable).")
 
     def manual_add_game(self):
         file_path = filedialog.askopenfilename(title="Select game executable", filetypes=[("Executable files", "*.exe")])
         if file_path:
-            file = os.path.basename(file_path)
-            base_name = os.path.splitext(file)[0]
-            query = self.clean_exe_name(base_name)
-            details = self.search_game_by_exe(query)
-            name = details.get("name", query) if details else query
-            self.library_items.append({
-                "path": file_path,
-                "name": name,
-                "favorite": False,
-                "date_added": datetime.now().isoformat()
-            })
-            self.update_library_display()
-            self.save_library()
+            if file_path in self.library_items:
+                messagebox.showinfo("Library", "This executable is already in the library.")
+                return
+            self.tasks.submit(self.resolve_exe_name, file_path,
+                              on_done=lambda name: self.add_manual_game(file_path, name))
 
-    def update_library_display(self, filter_text=""):
-        for widget in self.library_frame.winfo_children():
-            widget.destroy()
-        items = self.library_items.copy()
-        if self.library_sort_method == "name":
-            items.sort(key=lambda x: x.get("name", "").lower())
-        elif self.library_sort_method == "date":
-            items.sort(key=lambda x: x.get("date_added", ""), reverse=True)
-        display_items = []
-        for item in items:
-            if self.show_favorites_only and not item.get("favorite", False):
-                continue
-            if filter_text and filter_text.lower() not in item.get("name", "").lower():
-                continue
-            display_items.append(item)
-        for item in display_items:
-            frame = ctk.CTkFrame(self.library_frame)
-            frame.pack(fill="x", pady=5, padx=5)
-            icon_img = self.get_exe_icon(item["path"])
-            if icon_img:
-                ct_image = ctk.CTkImage(light_image=icon_img, dark_image=icon_img, size=(120,68))
-                btn_run = ctk.CTkButton(frame, image=ct_image, text="", command=lambda path=item["path"]: self.run_game(path), width=120, height=68)
-                btn_run.image = ct_image
+    def add_manual_game(self, file_path, name):
+        if file_path in self.library_items:
+            return
+        item = LibraryItem(file_path, name)
+        self.library_items.add(item)
+        self.save_resolve_cache()
+        self.show_new_library_items([item])
+        self.mark_library_dirty()
+
+    def update_library_display(self, filter_text=None):
+        # Full pass: re-sort and re-filter. The list reconciles rows by path, so rows whose item
+        # did not move are left alone. Single-item changes go through the narrower methods below.
+        if self.library_list is None or not self.library_list.winfo_exists():
+            return
+        if filter_text is not None:
+            if filter_text == self.library_filter_text and self.library_list.items:
+                return  # Keys that don't edit the text (arrows, modifiers)
+            self.library_filter_text = filter_text
+        keys = self.library_matching_keys()
+        display_items = [item for key, item in self.library_items.ordered(self.library_sort_method)
+                         if (keys is None or key in keys) and (not self.show_favorites_only or item.favorite)]
+        if self.library_sort_method == "size":
+            # Sizes come from the cache (unknown ones sort last and fill in as they are computed).
+            display_items.sort(key=self.library_sort_key, reverse=True)
+        self.library_list.set_items(display_items, keep_position=True, empty_text="No games in the library.")
+
+    def library_matching_keys(self):
+        # Keys matching the filter query, or None when there is no filter. The result is reused
+        # until the query or the library changes; favorite toggles only matter to fav: queries.
+        text = self.library_filter_text
+        index = self.library_items
+        if self.library_filter_cache is not None:
+            version, favorites_version, cached_text, cached_keys = self.library_filter_cache
+            if (cached_text == text and version == index.version
+                    and favorites_version in (None, index.favorites_version)):
+                return cached_keys
+        keys = index.query(text)
+        uses_favorites = any(clause[0] == "fav" for clause in parse_library_query(text))
+        self.library_filter_cache = (index.version, index.favorites_version if uses_favorites else None, text, keys)
+        return keys
+
+    def library_sort_key(self, item):
+        if self.library_sort_method == "date":
+            return item.date_added
+        if self.library_sort_method == "size":
+            size = self.library_item_size(item)
+            return -1 if size is None else size
+        return item.name.lower()
+
+    def library_item_size(self, item):
+        root = self.library_size_root(item)
+        return None if root is None else self.disk_usage.get(root)
+
+    def library_size_root(self, item):
+        # The folder sized for a library item, or None (size unknown) when it is a storage root
+        # or holds another entry's install folder. Worked out for the whole library once per version,
+        # reusing the install folders of items already seen.
+        version, roots = self.library_size_roots
+        if version != self.library_items.version:
+            installs = {}
+            for other in self.library_items:
+                known = roots.get(other.path)
+                installs[other.path] = known[0] if known else game_install_root(other.path)
+            shared = shared_install_roots(root for root in installs.values() if root is not None)
+            roots = {path: (root, None if root is None or library_path_key(root) in shared else root)
+                     for path, root in installs.items()}
+            self.library_size_roots = (self.library_items.version, roots)
+        entry = roots.get(item.path)
+        return entry[1] if entry else None
+
+    def library_item_visible(self, item):
+        if self.show_favorites_only and not item.favorite:
+            return False
+        keys = self.library_matching_keys()
+        return keys is None or library_path_key(item.path) in keys
+
+    def library_insert_position(self, item):
+        # Binary search in the displayed (already sorted) list; date and size orders are descending.
+        items = self.library_list.items
+        key = self.library_sort_key(item)
+        descending = self.library_sort_method in ("date", "size")
+        lo, hi = 0, len(items)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key = self.library_sort_key(items[mid])
+            if (key > mid_key) if descending else (key < mid_key):
+                hi = mid
             else:
-                btn_run = ctk.CTkButton(frame, text="No Image", command=lambda path=item["path"]: self.run_game(path), width=120, height=68)
-            btn_run.grid(row=0, column=0, padx=5, pady=5)
-            ctk.CTkLabel(frame, text=item.get("name", "Unknown"), font=("Helvetica", 14)).grid(row=0, column=1, padx=5, sticky="w")
-            fav_text = "★" if item.get("favorite", False) else "☆"
-            btn_fav = ctk.CTkButton(frame, text=fav_text, width=40, command=lambda item=item: self.toggle_favorite(item))
-            btn_fav.grid(row=0, column=2, padx=5)
-            btn_folder = ctk.CTkButton(frame, text="Open Folder", width=80, command=lambda path=item["path"]: self.open_game_folder(path))
-            btn_folder.grid(row=0, column=3, padx=5)
-            btn_remove = ctk.CTkButton(frame, text="Remove", command=lambda item=item: self.remove_library_item(item), width=80)
-            btn_remove.grid(row=0, column=4, padx=5)
-            frame.grid_columnconfigure(1, weight=1)
-        self.save_library()
+                lo = mid + 1
+        return lo
+
+    def show_new_library_items(self, items):
+        if self.library_list is None or not self.library_list.winfo_exists():
+            return
+        visible = [item for item in items if self.library_item_visible(item)]
+        if visible:
+            self.library_list.insert_items(visible, self.library_insert_position)
+
+    def create_library_row(self, parent):
+        row = ctk.CTkFrame(parent)
+        row.run_btn = ctk.CTkButton(row, text="No Image", width=120, height=68)
+        row.run_btn.grid(row=0, column=0, padx=5, pady=5)
+        row.name_label = ctk.CTkLabel(row, text="", font=("Helvetica", 14))
+        row.name_label.grid(row=0, column=1, padx=5, sticky="w")
+        row.name_color = row.name_label.cget("text_color")
+        row.fav_btn = ctk.CTkButton(row, text="☆", width=40)
+        row.fav_btn.grid(row=0, column=2, padx=5)
+        row.folder_btn = ctk.CTkButton(row, text="Open Folder", width=80)
+        row.folder_btn.grid(row=0, column=3, padx=5)
+        row.remove_btn = ctk.CTkButton(row, text="Remove", width=80)
+        row.remove_btn.grid(row=0, column=4, padx=5)
+        row.grid_columnconfigure(1, weight=1)
+        return row
+
+    def bind_library_row(self, row, item):
+        path = item.path
+        icon_img = self.icon_cache.get(path)
+        if icon_img:
+            ct_image = ctk.CTkImage(light_image=icon_img, dark_image=icon_img, size=(120,68))
+            row.run_btn.configure(image=ct_image, text="")
+            row.run_btn.image = ct_image
+        else:
+            row.run_btn.configure(image=None, text="No Image")
+        row.run_btn.configure(command=lambda: self.run_game(path))
+        health = self.health_of(item)
+        name = item.name or "Unknown"
+        if health == "missing":
+            row.name_label.configure(text=f"{name} (missing)", text_color="red")
+        elif health == "unreachable":
+            row.name_label.configure(text=f"{name} (drive unavailable)", text_color="gray")
+        else:
+            size = self.library_item_size(item)
+            size_text = f" ({format_size(size)})" if size is not None else ""
+            row.name_label.configure(text=f"{name}{size_text}", text_color=row.name_color)
+        row.fav_btn.configure(text="★" if item.favorite else "☆", command=lambda: self.toggle_favorite(item))
+        row.folder_btn.configure(command=lambda: self.open_game_folder(path))
+        row.remove_btn.configure(command=lambda: self.remove_library_item(item))
+
+    def on_icon_ready(self, path):
+        if self.library_list is None or not self.library_list.winfo_exists():
+            return
+        key = library_path_key(path)
+        self.library_list.refresh(lambda item: library_path_key(item.path) == key)
 
     def open_game_folder(self, game_path):
         folder = os.path.dirname(game_path)
@@ -983,28 +3686,28 @@ class SteamManagerApp:
             messagebox.showerror("Error", "Folder not found.")
 
     def toggle_favorite(self, item):
-        item["favorite"] = not item.get("favorite", False)
-        self.update_library_display()
+        self.library_items.set_favorite(item.path, not item.favorite)
+        self.mark_library_dirty()
+        key = library_path_key(item.path)
+        if not self.library_item_visible(item):
+            self.library_list.remove(key)
+            return
+        row = self.library_list.row_for(key)
+        if row is not None:
+            row.fav_btn.configure(text="★" if item.favorite else "☆")
 
     def toggle_favorites_filter(self):
         self.show_favorites_only = not self.show_favorites_only
         self.update_library_display()
 
-    def export_library(self):
+    def export_library(self, parent_win):
         filename = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
         if not filename:
             return
-        try:
-            with open(filename, "w", newline="", encoding="utf-8") as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(["Name", "Path", "Favorite", "Date Added"])
-                for item in self.library_items:
-                    writer.writerow([item.get("name", "Unknown"), item.get("path", ""), item.get("favorite", False), item.get("date_added", "")])
-            messagebox.showinfo("Exported", f"Library exported successfully to {filename}")
-            self.log(f"Library exported to {filename}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export library: {str(e)}")
-            self.log(f"Error exporting library: {str(e)}")
+        task = CsvExport(filename, list(self.library_items))
+        progress = self.open_progress_window("Exporting...", "Exporting library, please wait...", task.cancel)
+        task.start()
+        self.root.after(SCAN_POLL_MS, lambda: self.poll_csv_task(task, parent_win, progress, 0))
 
     def run_game(self, path):
         if os.name != "nt":
@@ -1017,10 +3720,95 @@ class SteamManagerApp:
             messagebox.showerror("Error", f"Failed to run game: {str(e)}")
 
     def remove_library_item(self, item):
-        if item in self.library_items:
-            self.library_items.remove(item)
+        if self.library_items.remove(item.path) is not None:
+            self.mark_library_dirty()
+        self.health_status.pop(library_path_key(item.path), None)
+        self.library_list.remove(library_path_key(item.path))
+
+    def toggle_health_check(self):
+        if self.health_check is not None:
+            self.health_check.cancel()
+            return
+        self.start_health_check()
+
+    def start_health_check(self, paths=None):
+        # Checks every library path by default; returns False if a check is already running.
+        if self.health_check is not None:
+            return False
+        if paths is None:
+            paths = [item.path for item in self.library_items]
+        self.health_check = HealthCheck(paths)
+        self.health_check.start()
+        self.log(f"Checking {len(paths)} library paths.")
+        self.update_health_buttons()
+        self.root.after(SCAN_POLL_MS, self.poll_health_check, self.health_check)
+        return True
+
+    def poll_health_check(self, check):
+        finished = False
+        batches = []
+        while True:
+            try:
+                batch = check.events.get_nowait()
+            except queue.Empty:
+                break
+            if batch is None:
+                finished = True
+                break
+            batches.append(batch)
+        self.apply_health_results(batches)
+        if not finished:
+            self.update_health_buttons()
+            self.root.after(SCAN_POLL_MS, self.poll_health_check, check)
+            return
+        self.health_check = None
+        self.save_health_cache()
+        self.update_health_buttons()
+        cancelled = " (cancelled)" if check.cancelled.is_set() else ""
+        self.log(f"Health check finished{cancelled}: {check.checked} paths checked, {check.missing} missing.")
+
+    def apply_health_results(self, batches):
+        changed = set()
+        now = time.time()
+        for batch in batches:
+            for path, status in batch:
+                key = library_path_key(path)
+                if key in self.library_items:
+                    self.health_status[key] = [status, now]
+                    changed.add(key)
+        if changed and self.library_list is not None and self.library_list.winfo_exists():
+            self.library_list.refresh(lambda item: library_path_key(item.path) in changed)
+
+    def health_of(self, item):
+        entry = self.health_status.get(library_path_key(item.path))
+        return entry[0] if entry else None
+
+    def update_health_buttons(self):
+        if self.library_health_btn is None or not self.library_health_btn.winfo_exists():
+            return
+        check = self.health_check
+        if check is not None:
+            self.library_health_btn.configure(text=f"Checking {check.checked}/{check.total} (Cancel)")
+        else:
+            self.library_health_btn.configure(text="Check Health")
+        missing = sum(1 for item in self.library_items if self.health_of(item) == "missing")
+        self.library_prune_btn.configure(text=f"Remove Missing ({missing})",
+                                         state="normal" if missing and check is None else "disabled")
+
+    def prune_missing_library_items(self):
+        missing = [item for item in self.library_items if self.health_of(item) == "missing"]
+        if not missing:
+            return
+        if not messagebox.askyesno("Remove Missing", f"Remove {len(missing)} games whose executable no longer exists?"):
+            return
+        for item in missing:
+            self.library_items.remove(item.path)
+            self.health_status.pop(library_path_key(item.path), None)
+        self.mark_library_dirty()
+        self.save_health_cache()
         self.update_library_display()
-        self.save_library()
+        self.update_health_buttons()
+        self.log(f"Removed {len(missing)} missing games from the library.")
 
     def clean_exe_name(self, exe_name):
         name = exe_name.lower().replace("_", " ").replace("-", " ")
@@ -1033,14 +3821,27 @@ class SteamManagerApp:
         return cleaned.strip()
 
     def get_exe_icon(self, exe_path, size=(120, 68)):
-        if os.name != "nt":
-            return None
+        try:
+            img = extract_pe_icon(exe_path, size)
+            if img is not None or os.name != "nt":
+                return img
+        except Exception as e:
+            if os.name != "nt":
+                self.log(f"Error extracting icon from {exe_path}: {str(e)}")
+                return None
+        return self.get_exe_icon_gdi(exe_path, size)
+
+    def get_exe_icon_gdi(self, exe_path, size=(120, 68)):
+        # Fallback for what the PE reader can't handle; every GDI handle is released on the way out.
+        large, small = [], []
+        screen_dc = hdc = hdc_mem = hbmp = None
         try:
             large, small = win32gui.ExtractIconEx(exe_path, 0)
             hicon = large[0] if large else (small[0] if small else None)
             if hicon is None:
                 return None
-            hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
+            screen_dc = win32gui.GetDC(0)
+            hdc = win32ui.CreateDCFromHandle(screen_dc)
             hbmp = win32ui.CreateBitmap()
             hbmp.CreateCompatibleBitmap(hdc, size[0], size[1])
             hdc_mem = hdc.CreateCompatibleDC()
@@ -1048,48 +3849,70 @@ class SteamManagerApp:
             win32gui.DrawIconEx(hdc_mem.GetHandleOutput(), 0, 0, hicon, size[0], size[1], 0, None, win32con.DI_NORMAL)
             bmpinfo = hbmp.GetInfo()
             bmpstr = hbmp.GetBitmapBits(True)
-            img = Image.frombuffer('RGB', (bmpinfo['bmWidth'], bmpinfo['bmHeight']), bmpstr, 'raw', 'BGRX', 0, 1)
-            win32gui.DestroyIcon(hicon)
-            return img
+            return Image.frombuffer('RGB', (bmpinfo['bmWidth'], bmpinfo['bmHeight']), bmpstr, 'raw', 'BGRX', 0, 1)
         except Exception as e:
             self.log(f"Error extracting icon from {exe_path}: {str(e)}")
             return None
+        finally:
+            for hicon in list(large) + list(small):
+                win32gui.DestroyIcon(hicon)
+            if hdc_mem is not None:
+                hdc_mem.DeleteDC()
+            if hbmp is not None:
+                win32gui.DeleteObject(hbmp.GetHandle())
+            if screen_dc is not None:
+                win32gui.ReleaseDC(0, screen_dc)
 
     def get_app_details(self, appid):
         if appid in self.appid_cache:
             return self.appid_cache[appid]
         try:
-            resp = requests.get(
-                "https://store.steampowered.com/api/appdetails",
-                params={"appids": appid},
-                timeout=10,
-            )
-            data = resp.json()
-            details = data.get(str(appid), {}).get("data", {})
-            self.appid_cache[appid] = details
-            return details
+            return self.fetch_app_details(appid)
         except Exception as e:
             self.log(f"Failed to fetch details for AppID {appid}: {str(e)}")
             return {}
 
+    def fetch_app_details(self, appid):
+        # Always hits the store API (errors propagate) and replaces the cached entry.
+        resp = requests.get(
+            "https://store.steampowered.com/api/appdetails",
+            params={"appids": appid},
+            timeout=10,
+        )
+        data = resp.json()
+        details = data.get(str(appid), {}).get("data", {})
+        details = {field: details[field] for field in APP_DETAILS_FIELDS if field in details}
+        self.appid_cache[appid] = details
+        self.appid_fetched[appid] = time.time()
+        self.app_details_dirty = True
+        return details
+
     def get_game_name(self, appid):
         details = self.get_app_details(appid)
         return details.get("name", "Unknown")
 
+    def match_exe_offline(self, query):
+        matcher = self.get_app_matcher()
+        if matcher is None:
+            return None
+        app, score = matcher.match(query)
+        if app is None or score < OFFLINE_MATCH_THRESHOLD:
+            return None
+        return {"appid": str(app["appid"]), "name": app["name"]}
+
     def search_game_by_exe(self, query):
-        try:
-            resp = requests.get(
-                f"https://steamcommunity.com/actions/SearchApps/{query}",
-                timeout=5,
-            )
-            results = resp.json()
-            if results:
-                appid = results[0].get("appid")
-                if appid:
-                    return self.get_app_details(appid)
-        except Exception as e:
-            self.log(f"Search by exe failed for '{query}': {str(e)}")
-        return {}
+        # Returns {"appid", "name"} for the best match or None; network errors propagate to the caller.
+        resp = requests.get(
+            f"https://steamcommunity.com/actions/SearchApps/{requests.utils.quote(query)}",
+            timeout=5,
+        )
+        resp.raise_for_status()
+        results = resp.json()
+        if results and results[0].get("appid"):
+            appid = str(results[0]["appid"])
+            name = results[0].get("name") or self.get_game_name(appid)
+            return {"appid": appid, "name": name}
+        return None
 
     # ───────────────────────────────
     # SETTINGS WINDOW WITH ADVANCED OPTIONS (Buttons arranged side by side)
@@ -1183,6 +4006,22 @@ class SteamManagerApp:
             minimalist_check = ctk.CTkCheckBox(self.advanced_options_frame, text="Minimalist Mode", variable=self.minimalist_var,
                                                 command=lambda: self.set_minimalist_mode(self.minimalist_var.get()))
             minimalist_check.pack(pady=2, anchor="w", padx=10)
+            scan_frame = ctk.CTkFrame(self.advanced_options_frame, fg_color="transparent")
+            scan_frame.pack(pady=2, anchor="w", padx=10)
+            ctk.CTkLabel(scan_frame, text="Scan Budget:").pack(side="left")
+            scan_count_option = ctk.CTkOptionMenu(scan_frame, values=["100 exes", "500 exes", "2000 exes", "No exe limit"], width=120,
+                                                  command=lambda choice: self.set_scan_budget(max_exes=choice))
+            scan_count_option.set(f"{self.scan_max_exes} exes" if self.scan_max_exes else "No exe limit")
+            scan_count_option.pack(side="left", padx=5)
+            scan_time_option = ctk.CTkOptionMenu(scan_frame, values=["30 s", "120 s", "600 s", "No time limit"], width=120,
+                                                 command=lambda choice: self.set_scan_budget(max_seconds=choice))
+            scan_time_option.set(f"{self.scan_max_seconds} s" if self.scan_max_seconds else "No time limit")
+            scan_time_option.pack(side="left", padx=5)
+            steam_exe_frame = ctk.CTkFrame(self.advanced_options_frame, fg_color="transparent")
+            steam_exe_frame.pack(pady=2, anchor="w", padx=10)
+            ctk.CTkLabel(steam_exe_frame, text="Steam Executable:").pack(side="left")
+            ctk.CTkButton(steam_exe_frame, text="Browse", width=80, command=self.choose_steam_exe).pack(side="left", padx=5)
+            ctk.CTkButton(steam_exe_frame, text="Default", width=80, command=lambda: self.set_steam_exe("")).pack(side="left", padx=5)
             self.advanced_options_button.configure(text="Hide Advanced Options ▴")
             self.advanced_options_visible = True
 
@@ -1198,6 +4037,25 @@ class SteamManagerApp:
         self.log(f"Minimalist mode set to {self.minimalist_mode}.")
         self.initialize_main_window()
 
+    def set_scan_budget(self, max_exes=None, max_seconds=None):
+        if max_exes is not None:
+            self.scan_max_exes = int(max_exes.split()[0]) if max_exes[0].isdigit() else 0
+        if max_seconds is not None:
+            self.scan_max_seconds = int(max_seconds.split()[0]) if max_seconds[0].isdigit() else 0
+        self.save_config()
+        self.log(f"Scan budget set to {self.scan_max_exes or 'unlimited'} executables, {self.scan_max_seconds or 'unlimited'} seconds.")
+
+    def choose_steam_exe(self):
+        file_path = filedialog.askopenfilename(title="Select the Steam executable")
+        if file_path:
+            self.set_steam_exe(file_path)
+
+    def set_steam_exe(self, path):
+        self.steam_exe = path
+        self.save_config()
+        self.log(f"Steam executable set to {self.steam_exe_path() or 'steam.exe in the main path'}.")
+        self.tasks.submit(self.steam.refresh)
+
     def set_exit_behavior(self, choice):
         self.exit_to_tray = (choice == "Minimize to Tray")
         self.save_config()
@@ -1217,7 +4075,9 @@ class SteamManagerApp:
             return
         try:
             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Microsoft\Windows\CurrentVersion\Run", 0, winreg.KEY_SET_VALUE)
-            cmd = f'"{sys.executable}" "{os.path.abspath(sys.argv[0])}"'
+            # Through the launcher, so a login while the app is already open hands off in milliseconds.
+            launcher = os.path.join(os.path.dirname(os.path.abspath(__file__)), "launcher.py")
+            cmd = f'"{sys.executable}" "{launcher}"'
             winreg.SetValueEx(key, "SteamManagerApp", 0, winreg.REG_SZ, cmd)
             winreg.CloseKey(key)
             self.log("Added to startup in registry.")
@@ -1378,4 +4238,4 @@ class SteamManagerApp:
         messagebox.showinfo("Donate", f"Donation address copied to clipboard:\n{address}")
 
 if __name__ == "__main__":
-    SteamManagerApp()
+    SteamManagerApp(*claim_instance(sys.argv[1:]))
@@ -0,0 +1,344 @@
+import argparse
+import os
+import glob
+import json
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from SteamManagerFINAL import (AppListMatcher, DiskUsage, FolderScan, HealthCheck, LibraryIndex, LibraryItem, SteamManagerApp,
+                               extract_pe_icon, folder_size, parse_date_added)
+
+
+def make_exe_tree(root, count, per_dir=50):
+    paths = []
+    for i in range(count):
+        folder = os.path.join(root, f"Game{i // per_dir:05d}")
+        if i % per_dir == 0:
+            os.makedirs(folder)
+        path = os.path.join(folder, f"game{i:05d}.exe")
+        open(path, "wb").close()
+        paths.append(path)
+    return paths
+
+
+def bench_library_scan(library_size=20000, exe_count=20000, linear_sample=500):
+    # Scan a tree of `exe_count` executables into a library that already holds `library_size`
+    # items; half of the executables on disk are already in the library.
+    tmp = tempfile.mkdtemp(prefix="steammanager-bench-")
+    try:
+        on_disk = make_exe_tree(tmp, exe_count)
+        existing = on_disk[: exe_count // 2]
+        existing += [os.path.join(tmp, "Elsewhere", f"old{i:05d}.exe") for i in range(library_size - len(existing))]
+        items = [LibraryItem(p, os.path.basename(p)) for p in existing]
+
+        library = LibraryIndex(items)
+        start = time.perf_counter()
+        added = 0
+        for root_dir, dirs, files in os.walk(tmp):
+            for file in files:
+                if file.lower().endswith(".exe"):
+                    full_path = os.path.join(root_dir, file)
+                    if full_path not in library:
+                        library.add(LibraryItem(full_path, file))
+                        added += 1
+        indexed = time.perf_counter() - start
+        print(f"indexed scan: {exe_count} exes into {library_size} items, {added} added in {indexed:.3f}s")
+
+        # The old list scan is quadratic; time a sample of new paths (worst case, full miss) and extrapolate.
+        library_list = list(items)
+        start = time.perf_counter()
+        for full_path in on_disk[-linear_sample:]:
+            if not any(item.path == full_path for item in library_list):
+                library_list.append(LibraryItem(full_path))
+        sample = time.perf_counter() - start
+        estimate = sample * exe_count / linear_sample
+        print(f"linear scan:  {linear_sample} exes in {sample:.3f}s, ~{estimate:.1f}s extrapolated to {exe_count}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def make_game_drive(root, games, files_per_dir=40):
+    # Game folders with the usual clutter: a redistributables folder and a big shader cache.
+    for g in range(games):
+        game = os.path.join(root, f"Game {g:04d}")
+        for sub, count in (("bin", files_per_dir), ("data/levels", files_per_dir), ("_CommonRedist/vcredist", 10),
+                           ("shadercache", files_per_dir * 5)):
+            folder = os.path.join(game, sub)
+            os.makedirs(folder)
+            for i in range(count):
+                open(os.path.join(folder, f"file{i}.dat"), "wb").close()
+        open(os.path.join(game, "bin", f"game{g}.exe"), "wb").close()
+        open(os.path.join(game, "_CommonRedist", "vcredist", "vc_redist.x64.exe"), "wb").close()
+
+
+def bench_folder_walk(games=400):
+    # The old single os.walk (no pruning) against FolderScan's parallel, pruning scandir walk.
+    tmp = tempfile.mkdtemp(prefix="steammanager-bench-")
+    try:
+        make_game_drive(tmp, games)
+        start = time.perf_counter()
+        exes = [f for _, _, files in os.walk(tmp) for f in files if f.lower().endswith(".exe")]
+        elapsed = time.perf_counter() - start
+        print(f"os.walk:          {len(exes)} exes in {elapsed:.3f}s")
+        for walkers in (1, 4, 8):
+            scan = FolderScan(tmp, lambda path: False, os.path.basename, skip_reason=None, max_exes=0, walkers=walkers)
+            start = time.perf_counter()
+            scan.start()
+            while scan.events.get() is not None:
+                pass
+            elapsed = time.perf_counter() - start
+            print(f"scandir x{walkers} walkers: {scan.exes_found} exes, {scan.dirs_visited} dirs in {elapsed:.3f}s")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def bench_disk_usage(games=100):
+    # Size every game folder: a sequential walk, the parallel walk, then cached lookups.
+    tmp = tempfile.mkdtemp(prefix="steammanager-bench-")
+    try:
+        make_game_drive(tmp, games)
+        folders = [os.path.join(tmp, name) for name in sorted(os.listdir(tmp))]
+        start = time.perf_counter()
+        total = sum(folder_size(folder) for folder in folders)
+        elapsed = time.perf_counter() - start
+        print(f"sequential walk: {games} folders, {total} bytes in {elapsed:.3f}s")
+        ready = threading.Event()
+        pending = set(folders)
+
+        def on_ready(path):
+            pending.discard(path)
+            if not pending:
+                ready.set()
+
+        usage = DiskUsage(on_ready=on_ready, cache_file=os.path.join(tmp, "sizes.json"))
+        start = time.perf_counter()
+        for folder in folders:
+            usage.get(folder)
+        ready.wait()
+        elapsed = time.perf_counter() - start
+        print(f"DiskUsage:       {games} folders in {elapsed:.3f}s")
+        start = time.perf_counter()
+        ordered = sorted(folders, key=lambda folder: usage.get(folder), reverse=True)
+        elapsed = time.perf_counter() - start
+        print(f"sort by size:    {len(ordered)} folders from cache in {elapsed * 1000:.2f}ms")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def bench_health_check(library_size=10000, missing_every=10):
+    # Stat every library path: one at a time, as a naive check would, then with HealthCheck. On a
+    # warm local disk both are cheap; the pools pay off on cold HDDs and network shares.
+    tmp = tempfile.mkdtemp(prefix="steammanager-bench-")
+    try:
+        paths = make_exe_tree(tmp, library_size)
+        for path in paths[::missing_every]:
+            os.remove(path)
+        start = time.perf_counter()
+        missing = sum(not os.path.exists(path) for path in paths)
+        elapsed = time.perf_counter() - start
+        print(f"sequential:  {library_size} paths, {missing} missing in {elapsed:.3f}s")
+        check = HealthCheck(paths)
+        start = time.perf_counter()
+        check.start()
+        while check.events.get() is not None:
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"HealthCheck: {check.checked} paths, {check.missing} missing in {elapsed:.3f}s")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def bench_library_query(library_size=50000, rounds=20, seed=1):
+    # Multi-field queries against a synthetic library, compared with filtering every item.
+    rng = random.Random(seed)
+    words = ["dark", "souls", "witcher", "hunt", "wild", "space", "legend", "fallen", "empire", "night",
+             "city", "rise", "shadow", "quest", "star", "iron", "blood", "storm", "kingdom", "tactics"]
+    items = []
+    for i in range(library_size):
+        name = " ".join(rng.choice(words).capitalize() for _ in range(rng.randint(1, 4)))
+        drive = rng.choice("CDE")
+        path = f"{drive}:\\Games\\{name}\\bin\\game{i:05d}.exe"
+        date = f"{rng.randint(2019, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00"
+        items.append(LibraryItem(path, f"{name} {i}", rng.random() < 0.1, parse_date_added(date)))
+    start = time.perf_counter()
+    library = LibraryIndex(items)
+    built = time.perf_counter() - start
+    print(f"index build: {len(library)} items in {built:.2f}s")
+
+    queries = ["witcher", "dark souls", "fav:yes drive:D witcher added:>2024-01",
+               "path:shadow -storm", "added:2021-03..2022-06 quest"]
+    for query in queries:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            matched = library.query(query)
+        indexed = (time.perf_counter() - start) / rounds
+        print(f"{query!r}: {len(matched)} matches in {indexed * 1000:.2f}ms")
+
+    # Baseline: the previous per-item substring scan, for the single-word query only.
+    start = time.perf_counter()
+    for _ in range(rounds):
+        matched = [item for item in items if "witcher" in item.name.lower()]
+    linear = (time.perf_counter() - start) / rounds
+    print(f"linear 'witcher': {len(matched)} matches in {linear * 1000:.2f}ms")
+
+
+def bench_library_records(library_size=100000):
+    # Memory and date-sort cost of the old dict-per-item entries versus LibraryItem.
+    now = datetime.now()
+    rows = [(f"D:\\Games\\Game {i}\\game{i}.exe", f"Game {i}", i % 10 == 0,
+             (now - timedelta(minutes=i)).isoformat()) for i in range(library_size)]
+    for label, build, date_key in (
+            ("dict", lambda r: {"path": r[0], "name": r[1], "favorite": r[2], "date_added": r[3]}, lambda item: item["date_added"]),
+            ("LibraryItem", lambda r: LibraryItem(r[0], r[1], r[2], parse_date_added(r[3])), lambda item: item.date_added)):
+        tracemalloc.start()
+        items = [build(row) for row in rows]
+        # Row strings are shared by both variants; only the per-item containers differ.
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        sorted(items, key=date_key)
+        sort_time = time.perf_counter() - start
+        print(f"{label}: {size / library_size:.0f} bytes/item, date sort of {library_size} in {sort_time * 1000:.1f}ms")
+
+
+def bench_offline_match(app_count=150000, exe_count=500, seed=1):
+    # Resolve `exe_count` executable names against a synthetic app list the size of Steam's.
+    rng = random.Random(seed)
+    words = ["dark", "souls", "witcher", "hunt", "wild", "space", "legend", "fallen", "empire", "night",
+             "city", "rise", "shadow", "quest", "star", "iron", "blood", "storm", "kingdom", "tactics",
+             "racing", "simulator", "farm", "zombie", "craft", "dungeon", "hero", "world", "war", "ghost"]
+    apps = []
+    for appid in range(10, 10 + app_count):
+        name = " ".join(rng.choice(words).capitalize() for _ in range(rng.randint(1, 4)))
+        apps.append({"appid": appid, "name": f"{name} {rng.randint(1, 9999)}"})
+    start = time.perf_counter()
+    matcher = AppListMatcher(apps)
+    built = time.perf_counter() - start
+    print(f"index build: {len(matcher)} apps in {built:.2f}s")
+
+    cleaner = SteamManagerApp.__new__(SteamManagerApp)
+    exe_names = []
+    for app in rng.sample(apps, exe_count):
+        exe_names.append(app["name"].replace(" ", rng.choice(["_", "", "-"])) + rng.choice(["", "_x64", "-Win64"]))
+    start = time.perf_counter()
+    confident = 0
+    for exe_name in exe_names:
+        app, score = matcher.match(cleaner.clean_exe_name(exe_name))
+        confident += score >= 0.8
+    matched = time.perf_counter() - start
+    print(f"offline match: {exe_count} exes in {matched:.2f}s, {confident} confident (no HTTP needed)")
+
+
+def bench_icon_extract(rounds=20):
+    # Icons from the executables in BENCH_EXE_DIR, or from the launcher stubs pip ships with.
+    import pip
+    exe_dir = os.environ.get("BENCH_EXE_DIR") or os.path.join(os.path.dirname(pip.__file__), "_vendor", "distlib")
+    paths = sorted(glob.glob(os.path.join(exe_dir, "**", "*.exe"), recursive=True))
+    if not paths:
+        print(f"no executables found in {exe_dir}")
+        return
+    start = time.perf_counter()
+    extracted = sum(extract_pe_icon(path) is not None for path in paths * rounds)
+    elapsed = time.perf_counter() - start
+    calls = len(paths) * rounds
+    print(f"pure-Python: {calls} extractions ({extracted} icons) in {elapsed:.3f}s, {elapsed / calls * 1000:.2f}ms each")
+    if os.name == "nt":
+        app = SteamManagerApp.__new__(SteamManagerApp)
+        app.debug_mode = False
+        start = time.perf_counter()
+        for path in paths * rounds:
+            app.get_exe_icon_gdi(path)
+        elapsed = time.perf_counter() - start
+        print(f"GDI:         {calls} extractions in {elapsed:.3f}s, {elapsed / calls * 1000:.2f}ms each")
+
+
+# Runs in a fresh interpreter: times the import, then (with --interactive) starts the app and stops
+# it as soon as the main window is up and idle. Prints one JSON line.
+STARTUP_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import SteamManagerFINAL
+result = {"import": time.perf_counter() - start,
+          "loaded": [name for name in ("requests", "pystray", "csv", "webbrowser", "win32ui", "win32con") if name in sys.modules]}
+if "--interactive" in sys.argv:
+    finish_startup = SteamManagerFINAL.SteamManagerApp.finish_startup
+    def finish_and_report(self, splash, error=None):
+        finish_startup(self, splash, error)
+        def report():
+            result["interactive"] = time.perf_counter() - start
+            result["items"] = len(self.library_items)
+            self.root.quit()
+        self.root.after_idle(report)
+    SteamManagerFINAL.SteamManagerApp.finish_startup = finish_and_report
+    SteamManagerFINAL.SteamManagerApp()
+print(json.dumps(result))
+"""
+
+
+def bench_startup(library_size=20000, rounds=5):
+    # Import time (median of `rounds` fresh interpreters) and time-to-interactive with a library of
+    # `library_size` games, from a scratch working directory. Time-to-interactive needs a display.
+    tmp = tempfile.mkdtemp(prefix="steammanager-bench-")
+    try:
+        steam_dir = os.path.join(tmp, "Steam")
+        os.makedirs(steam_dir)
+        open(os.path.join(steam_dir, "steam.exe"), "wb").close()
+        with open(os.path.join(tmp, "config.ini"), "w") as f:
+            f.write(f"[Paths]\nsteam_path = {steam_dir}\nextra_paths = \n\n[Settings]\n")
+        with open(os.path.join(tmp, "library.json"), "w", encoding="utf-8") as f:
+            json.dump([LibraryItem(os.path.join(tmp, "Games", f"game{i:05d}.exe"), f"Game {i}").to_dict()
+                       for i in range(library_size)], f)
+        repo = os.path.dirname(os.path.abspath(__file__))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (repo, os.environ.get("PYTHONPATH")))))
+
+        def probe(*args):
+            run = subprocess.run([sys.executable, "-c", STARTUP_PROBE, *args], cwd=tmp, env=env, capture_output=True, text=True)
+            if run.returncode != 0:
+                return None, (run.stderr.strip().splitlines() or [f"exit code {run.returncode}"])[-1]
+            return json.loads(run.stdout.strip().splitlines()[-1]), None
+
+        probe()  # Warm the bytecode cache
+        results = [probe()[0] for _ in range(rounds)]
+        import_time = statistics.median(result["import"] for result in results)
+        print(f"import:      {import_time * 1000:.0f}ms (median of {rounds}), "
+              f"deferred modules already loaded: {', '.join(results[0]['loaded']) or 'none'}")
+        result, error = probe("--interactive")
+        if result is None:
+            print(f"interactive: skipped ({error})")
+        else:
+            print(f"interactive: {result['interactive'] * 1000:.0f}ms after launch with {result['items']} library items")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+BENCHMARKS = {
+    "disk-usage": bench_disk_usage,
+    "folder-walk": bench_folder_walk,
+    "health-check": bench_health_check,
+    "icon-extract": bench_icon_extract,
+    "library-query": bench_library_query,
+    "library-records": bench_library_records,
+    "library-scan": bench_library_scan,
+    "offline-match": bench_offline_match,
+    "startup": bench_startup,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Steam Manager micro-benchmarks")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all): {', '.join(sorted(BENCHMARKS))}")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    for name in args.names or sorted(BENCHMARKS):
+        print(f"== {name}")
+        BENCHMARKS[name]()
@@ -0,0 +1,122 @@
+import os
+import sys
+import socket
+import threading
+import zlib
+
+INSTANCE_HOST = "127.0.0.1"
+INSTANCE_MAGIC = "STEAMMANAGER/1"  # First word of every IPC request, so a stranger on the port is never mistaken for us
+INSTANCE_COMMANDS = ("show", "refresh-manifests")
+INSTANCE_TIMEOUT = 2           # Seconds a launch waits for the running instance to acknowledge its command
+
+
+def instance_port():
+    # One instance per user: a fixed port below the Windows and Linux ephemeral ranges.
+    user = os.environ.get("USERNAME") or os.environ.get("USER") or ""
+    return 20000 + zlib.crc32(user.lower().encode("utf-8")) % 10000
+
+
+def launch_command(argv):
+    return "refresh-manifests" if "--refresh-manifests" in argv else "show"
+
+
+def send_to_instance(command, port=None):
+    # True once a running instance has acknowledged `command`; False if none is listening.
+    try:
+        with socket.create_connection((INSTANCE_HOST, port or instance_port()), timeout=INSTANCE_TIMEOUT) as conn:
+            conn.sendall(f"{INSTANCE_MAGIC} {command}\n".encode("utf-8"))
+            return conn.makefile("rb").readline(16).strip() == b"OK"
+    except OSError:
+        return False
+
+
+class InstanceServer:
+    # The single-instance lock and its command channel: a listening localhost socket, which no
+    # second instance can bind while this one holds it. Each connection carries one
+    # "<INSTANCE_MAGIC> <command>" line and is read on its own thread, so a silent client holds up
+    # nobody else; known commands are acknowledged with OK and passed to on_command from that
+    # thread. Commands arriving before set_handler() are held back, and after close() refused.
+    def __init__(self, sock):
+        self.sock = sock
+        self.on_command = None
+        self._held = []
+        self._closed = False
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    @classmethod
+    def listen(cls, port=None):
+        # The server, or None if the port is taken (by another instance, or by something else).
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            if os.name == "nt":
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+            else:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)  # Never shares a listening port on POSIX
+            sock.bind((INSTANCE_HOST, port or instance_port()))
+            sock.listen(4)
+        except OSError:
+            sock.close()
+            return None
+        return cls(sock)
+
+    def set_handler(self, on_command):
+        with self._lock:
+            self.on_command = on_command
+            held, self._held = self._held, []
+        for command in held:
+            on_command(command)
+
+    def close(self):
+        self._closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)  # Wakes the pending accept()
+        except OSError:
+            pass
+        self.sock.close()
+
+    def _run(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return  # Closed
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        with conn:
+            try:
+                conn.settimeout(INSTANCE_TIMEOUT)
+                words = conn.makefile("rb").readline(256).decode("utf-8", "replace").split()
+                if len(words) != 2 or words[0] != INSTANCE_MAGIC or words[1] not in INSTANCE_COMMANDS:
+                    return
+                if self._closed:
+                    return  # Shutting down: without an OK the new launch starts on its own
+                conn.sendall(b"OK\n")
+            except OSError:
+                return
+        with self._lock:
+            on_command = self.on_command
+            if on_command is None:
+                self._held.append(words[1])
+        if on_command is not None:
+            on_command(words[1])
+
+
+def claim_instance(argv):
+    # Binds the instance port first, so a cold start never waits on a connect. Returns the
+    # InstanceServer (None if the port is held by something that isn't us) and this launch's
+    # command; exits once a running instance has taken the command.
+    command = launch_command(argv)
+    instance = InstanceServer.listen()
+    if instance is None and send_to_instance(command):
+        sys.exit(0)  # Another instance holds the port and has taken the command
+    return instance, command
+
+
+# The quick entry point: a second launch hands its command to the running instance and exits
+# having imported only this module. The GUI modules load once this launch is the app.
+if __name__ == "__main__":
+    instance, command = claim_instance(sys.argv[1:])
+    from SteamManagerFINAL import SteamManagerApp
+    SteamManagerApp(instance, command)
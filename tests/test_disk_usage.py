@@ -0,0 +1,35 @@
+import json
+import threading
+
+from SteamManagerFINAL import DiskUsage, library_path_key
+
+
+def test_cache_is_read_by_load_not_the_constructor(tmp_path):
+    game = tmp_path / "Game"
+    game.mkdir()
+    (game / "data.pak").write_bytes(b"x" * 1000)
+    cache = tmp_path / "sizes.json"
+    mtime = game.stat().st_mtime_ns
+    cache.write_text(json.dumps({library_path_key(str(game)): [mtime, 1000], "elsewhere": [1, 5]}))
+
+    ready = threading.Event()
+    usage = DiskUsage(on_ready=lambda path: ready.set(), cache_file=str(cache))
+    assert usage._sizes == {}
+    usage.load()
+    assert usage.get(str(game)) == 1000
+    assert usage._sizes["elsewhere"] == [1, 5]
+
+
+def test_load_keeps_sizes_computed_before_it(tmp_path):
+    game = tmp_path / "Game"
+    game.mkdir()
+    (game / "data.pak").write_bytes(b"x" * 1000)
+    cache = tmp_path / "sizes.json"
+    cache.write_text(json.dumps({library_path_key(str(game)): [0, 1]}))
+
+    ready = threading.Event()
+    usage = DiskUsage(on_ready=lambda path: ready.set(), cache_file=str(cache))
+    assert usage.get(str(game)) is None
+    assert ready.wait(5)
+    usage.load()
+    assert usage.get(str(game)) == 1000
@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from SteamManagerFINAL import SCAN_CHECKPOINT_VERSION, FolderScan
+
+
+@pytest.fixture
+def games(tmp_path):
+    # Three games with their executables one level down, as most installs are laid out.
+    root = tmp_path / "games"
+    for game in ("Alpha", "Beta", "Gamma"):
+        folder = root / game / "bin"
+        folder.mkdir(parents=True)
+        (folder / f"{game.lower()}.exe").write_bytes(b"")
+    return root
+
+
+class Library:
+    def __init__(self):
+        self.paths = set()
+
+    def __contains__(self, path):
+        return path in self.paths
+
+
+def run_scan(root, library, resolve=None, **kwargs):
+    kwargs.setdefault("skip_reason", None)
+    scan = FolderScan(str(root), library.__contains__, resolve or (lambda path: os.path.basename(path)), **kwargs)
+    scan.start()
+    items = []
+    while True:
+        batch = scan.events.get(timeout=10)
+        if batch is None:
+            break
+        items.extend(batch)
+    library.paths.update(item.path for item in items)
+    return scan, items
+
+
+def test_failed_lookups_are_reported_and_retried(games, tmp_path):
+    library = Library()
+    checkpoint = str(tmp_path / "scan.json")
+
+    def flaky(path):
+        if "beta" in path:
+            raise ConnectionError("store unreachable")
+        return os.path.basename(path)
+
+    scan, items = run_scan(games, library, flaky, checkpoint_path=checkpoint)
+    assert sorted(item.name for item in items) == ["alpha.exe", "gamma.exe"]
+    assert len(scan.errors) == 1 and "store unreachable" in scan.errors[0]
+    assert scan.lookups_pending == 0
+    state = json.load(open(checkpoint))
+    assert not state["complete"] and len(state["pending"]) == 1
+
+    scan, items = run_scan(games, library, checkpoint_path=checkpoint)
+    assert scan.resumed and not scan.errors
+    assert [item.name for item in items] == ["beta.exe"]
+
+
+def test_failed_walkers_are_reported(games):
+    def skip_reason(path):
+        if "gamma" in path:
+            raise PermissionError("denied")
+        return None
+
+    scan, items = run_scan(games, Library(), skip_reason=skip_reason)
+    assert sorted(item.name for item in items) == ["alpha.exe", "beta.exe"]
+    assert len(scan.errors) == 1
+    assert scan.errors[0].startswith(str(games / "Gamma")) and "denied" in scan.errors[0]
+
+
+def test_resume_after_budget_stop(games, tmp_path):
+    library = Library()
+    checkpoint = str(tmp_path / "scan.json")
+    scan, first = run_scan(games, library, max_exes=2, checkpoint_path=checkpoint)
+    assert len(first) == 2 and scan.stop_reason == "limit of 2 executables reached"
+    assert not json.load(open(checkpoint))["complete"]
+
+    scan, rest = run_scan(games, library, max_exes=2, checkpoint_path=checkpoint)
+    assert scan.resumed and scan.stop_reason is None
+    assert sorted(item.name for item in first + rest) == ["alpha.exe", "beta.exe", "gamma.exe"]
+    assert json.load(open(checkpoint))["complete"]
+
+
+def test_resume_after_cancel_requeues_pending_lookups(games, tmp_path):
+    library = Library()
+    checkpoint = str(tmp_path / "scan.json")
+    started, release = threading.Event(), threading.Event()
+
+    def slow(path):
+        started.set()
+        release.wait(10)
+        return os.path.basename(path)
+
+    scan = FolderScan(str(games), library.__contains__, slow, skip_reason=None, workers=1,
+                      checkpoint_path=checkpoint)
+    scan.start()
+    assert started.wait(10)
+    while scan.exes_found < 3 and not scan.events.qsize():
+        time.sleep(0.01)
+    scan.cancel()  # Lookups still queued behind the slow one are skipped and stay pending
+    release.set()
+    first = []
+    while (batch := scan.events.get(timeout=10)) is not None:
+        first.extend(batch)
+    library.paths.update(item.path for item in first)
+    state = json.load(open(checkpoint))
+    assert scan.stop_reason == "cancelled" and not state["complete"]
+    assert len(first) == 1 and len(state["pending"]) == 2
+
+    scan, rest = run_scan(games, library, checkpoint_path=checkpoint)
+    assert scan.resumed
+    assert sorted(item.name for item in first + rest) == ["alpha.exe", "beta.exe", "gamma.exe"]
+
+
+def test_resume_delivers_items_resolved_before_interruption(games, tmp_path):
+    checkpoint = str(tmp_path / "scan.json")
+    run_scan(games, Library(), max_exes=2, checkpoint_path=checkpoint)
+    # The first run's items never made it into the library (e.g. the app was closed).
+    scan, items = run_scan(games, Library(), checkpoint_path=checkpoint)
+    assert sorted(item.name for item in items) == ["alpha.exe", "beta.exe", "gamma.exe"]
+
+
+def bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_incremental_rescan_lists_only_changed_directories(games, tmp_path):
+    library = Library()
+    checkpoint = str(tmp_path / "scan.json")
+    scan, items = run_scan(games, library, checkpoint_path=checkpoint)
+    assert len(items) == 3 and scan.dirs_visited == 7
+
+    scan, items = run_scan(games, library, checkpoint_path=checkpoint)
+    assert not scan.resumed and items == []
+    assert scan.dirs_visited == 0 and scan.dirs_unchanged == 7
+
+    new_exe = games / "Beta" / "bin" / "beta_dx12.exe"
+    new_exe.write_bytes(b"")
+    bump_mtime(new_exe.parent)
+    scan, items = run_scan(games, library, checkpoint_path=checkpoint)
+    assert [item.path for item in items] == [str(new_exe)]
+    assert scan.dirs_visited == 1 and scan.dirs_unchanged == 6
+
+
+def test_rescan_finds_new_directories_and_forgets_deleted_ones(games, tmp_path):
+    library = Library()
+    checkpoint = str(tmp_path / "scan.json")
+    run_scan(games, library, checkpoint_path=checkpoint)
+
+    (games / "Delta").mkdir()
+    (games / "Delta" / "delta.exe").write_bytes(b"")
+    bump_mtime(games)
+    for path in (games / "Gamma" / "bin" / "gamma.exe", games / "Gamma" / "bin", games / "Gamma"):
+        path.unlink() if path.is_file() else path.rmdir()
+    bump_mtime(games)
+    scan, items = run_scan(games, library, checkpoint_path=checkpoint)
+    assert [item.name for item in items] == ["delta.exe"]
+    dirs = json.load(open(checkpoint))["dirs"]
+    assert str(games / "Delta") in dirs
+    assert not any("Gamma" in path for path in dirs)
+
+
+def partial_checkpoint(drop):
+    state = {"version": SCAN_CHECKPOINT_VERSION, "folder": "", "complete": False, "dirs": {},
+             "frontier": [], "pending": [], "resolved": [{"path": "elsewhere.exe", "name": "Elsewhere"}]}
+    del state[drop]
+    return json.dumps(state)
+
+
+@pytest.mark.parametrize("content", [
+    "not json",
+    "[]",
+    json.dumps({"version": -1, "complete": False}),
+    partial_checkpoint("pending"),
+    partial_checkpoint("frontier"),
+    partial_checkpoint("resolved"),
+    partial_checkpoint("dirs"),
+], ids=["not-json", "not-an-object", "old-version", "no-pending", "no-frontier", "no-resolved", "no-dirs"])
+def test_unusable_checkpoint_walks_from_the_top(games, tmp_path, content):
+    checkpoint = tmp_path / "scan.json"
+    checkpoint.write_text(content)
+    scan, items = run_scan(games, Library(), checkpoint_path=str(checkpoint))
+    assert not scan.resumed
+    assert sorted(item.name for item in items) == ["alpha.exe", "beta.exe", "gamma.exe"]
+    assert json.load(open(checkpoint))["complete"]
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from SteamManagerFINAL import LibraryIndex, LibraryItem, SteamManagerApp, game_install_root, shared_install_roots
+
+
+def path(*parts):
+    return os.path.join(os.sep, *parts)
+
+
+@pytest.mark.parametrize("exe, root", [
+    (path("lib", "steamapps", "common", "Game", "bin", "x64", "game.exe"), path("lib", "steamapps", "common", "Game")),
+    (path("lib", "Common", "Outer", "common", "Inner", "a", "b.exe"), path("lib", "Common", "Outer", "common", "Inner")),
+    (path("Games", "Hades", "Hades.exe"), path("Games", "Hades")),
+    (path("Games", "Witcher3", "bin", "x64", "witcher3.exe"), path("Games", "Witcher3")),
+    (path("Games", "foo.exe"), path("Games")),
+    (path("lib", "steamapps", "common", "foo.exe"), None),
+    (path("lib", "steamapps", "Common", "foo.exe"), None),
+    (path("foo.exe"), None),
+    (path("bin", "x64", "foo.exe"), None),
+])
+def test_game_install_root(exe, root):
+    assert game_install_root(exe) == root
+
+
+def test_shared_install_roots():
+    roots = [path("Games"), path("Games", "Bar"), path("Games Extra"), path("Other", "Game"), path("Other", "Game2")]
+    assert shared_install_roots(roots) == {os.path.normcase(path("Games"))}
+
+
+def test_library_sizes_skip_folders_holding_other_games():
+    loose = LibraryItem(path("Games", "foo.exe"), "Foo")
+    bar = LibraryItem(path("Games", "Bar", "bin", "bar.exe"), "Bar")
+    on_root = LibraryItem(path("tool.exe"), "Tool")
+    app = SteamManagerApp.__new__(SteamManagerApp)
+    app.library_items = LibraryIndex([loose, bar, on_root])
+    app.library_size_roots = (None, {})
+    assert app.library_size_root(loose) is None
+    assert app.library_size_root(on_root) is None
+    assert app.library_size_root(bar) == path("Games", "Bar")
+
+    app.library_items.remove(bar.path)
+    assert app.library_size_root(loose) == path("Games")
@@ -0,0 +1,131 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from launcher import INSTANCE_MAGIC, InstanceServer, send_to_instance
+
+
+@pytest.fixture
+def port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+@pytest.fixture
+def server(port):
+    server = InstanceServer.listen(port)
+    assert server is not None
+    yield server
+    server.close()
+
+
+class Commands:
+    def __init__(self):
+        self.received = []
+        self.arrived = threading.Event()
+
+    def __call__(self, command):
+        self.received.append(command)
+        self.arrived.set()
+
+
+def raw_request(port, data):
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as conn:
+        conn.sendall(data)
+        return conn.makefile("rb").readline()
+
+
+def test_forwards_a_command(server, port):
+    commands = Commands()
+    server.set_handler(commands)
+    assert send_to_instance("refresh-manifests", port)
+    assert commands.arrived.wait(5)
+    assert commands.received == ["refresh-manifests"]
+
+
+def test_holds_commands_until_a_handler_is_set(server, port):
+    assert send_to_instance("show", port)
+    time.sleep(0.1)
+    commands = Commands()
+    server.set_handler(commands)
+    assert commands.received == ["show"]
+
+
+@pytest.mark.parametrize("data", [
+    b"GET / HTTP/1.1\r\n\r\n",
+    f"{INSTANCE_MAGIC} format-disk\n".encode(),
+    f"{INSTANCE_MAGIC} show extra\n".encode(),
+    b"STEAMMANAGER/0 show\n",
+    b"\xff\xfe\n",
+])
+def test_rejects_bogus_requests(server, port, data):
+    commands = Commands()
+    server.set_handler(commands)
+    assert raw_request(port, data) == b""  # Closed without an OK
+    assert not send_to_instance("format-disk", port)
+    time.sleep(0.1)
+    assert commands.received == []
+
+
+def test_silent_client_does_not_hold_up_others(server, port):
+    commands = Commands()
+    server.set_handler(commands)
+    with socket.create_connection(("127.0.0.1", port)):
+        start = time.monotonic()
+        assert send_to_instance("show", port)
+        assert time.monotonic() - start < 1
+    assert commands.arrived.wait(5)
+
+
+def test_second_server_cannot_bind(server, port):
+    assert InstanceServer.listen(port) is None
+
+
+def test_closed_server_refuses_commands_and_frees_the_port(port):
+    server = InstanceServer.listen(port)
+    commands = Commands()
+    server.set_handler(commands)
+    server.close()
+    assert not send_to_instance("show", port)
+    assert commands.received == []
+    again = InstanceServer.listen(port)
+    assert again is not None
+    again.close()
+
+
+def test_command_racing_close_gets_no_ok(server, port):
+    # A request already connected when the app shuts down must not be acknowledged and dropped.
+    commands = Commands()
+    server.set_handler(commands)
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as conn:
+        time.sleep(0.1)  # Accepted, now waiting for the request line
+        server.close()
+        conn.sendall(f"{INSTANCE_MAGIC} show\n".encode())
+        assert conn.makefile("rb").readline() == b""
+    assert commands.received == []
+
+
+def test_launcher_hands_off_without_loading_the_app(server, port, monkeypatch):
+    # What a second launch runs: the command reaches the running instance and the launch exits.
+    import launcher
+    commands = Commands()
+    server.set_handler(commands)
+    monkeypatch.setattr(launcher, "instance_port", lambda: port)
+    with pytest.raises(SystemExit) as exited:
+        launcher.claim_instance(["--refresh-manifests"])
+    assert exited.value.code == 0
+    assert commands.arrived.wait(5) and commands.received == ["refresh-manifests"]
+
+
+def test_launcher_binds_when_no_instance_runs(port, monkeypatch):
+    import launcher
+    monkeypatch.setattr(launcher, "instance_port", lambda: port)
+    instance, command = launcher.claim_instance([])
+    try:
+        assert command == "show" and instance is not None
+        assert InstanceServer.listen(port) is None
+    finally:
+        instance.close()
@@ -0,0 +1,105 @@
+import pytest
+
+from SteamManagerFINAL import LibraryIndex, LibraryItem, SteamManagerApp, parse_date_added, parse_library_query
+
+
+def item(path, name, favorite=False, added="2024-01-15T12:00:00"):
+    return LibraryItem(path, name, favorite, parse_date_added(added))
+
+
+@pytest.fixture
+def index():
+    return LibraryIndex([
+        item(r"C:\Games\Witcher3\bin\witcher3.exe", "The Witcher 3", favorite=True, added="2023-05-20T10:00:00"),
+        item(r"D:\Games\Hades\Hades.exe", "Hades", added="2024-01-01T00:00:00"),
+        item(r"D:\Games\DarkSouls\DarkSoulsIII.exe", "Dark Souls III", favorite=True, added="2024-02-10T08:30:00"),
+        item(r"E:\Steam Library\Celeste\Celeste.exe", "Celeste", added="2024-12-31T23:59:59"),
+    ])
+
+
+def names(index, text):
+    keys = index.query(text)
+    return None if keys is None else sorted(item.name for key, item in index.ordered() if key in keys)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("added:2024", ["Celeste", "Dark Souls III", "Hades"]),
+    ("added:2024-01", ["Hades"]),
+    ("added:2024-02-10", ["Dark Souls III"]),
+    ("added:>2024-01", ["Celeste", "Dark Souls III"]),
+    ("added:>=2024-01", ["Celeste", "Dark Souls III", "Hades"]),
+    ("added:<2024", ["The Witcher 3"]),
+    ("added:<=2024-01", ["Hades", "The Witcher 3"]),
+    ("added:2023-05..2024-01", ["Hades", "The Witcher 3"]),
+    ("added:2024-02..2024", ["Celeste", "Dark Souls III"]),
+    ("added:2024-13", []),
+    ("added:soon", []),
+])
+def test_added_ranges(index, text, expected):
+    assert names(index, text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("-added:2024", ["The Witcher 3"]),
+    ("-drive:D", ["Celeste", "The Witcher 3"]),
+    ("games -hades", ["Dark Souls III", "The Witcher 3"]),
+    ("-name:dark -path:steam", ["Hades", "The Witcher 3"]),
+    ("-fav:yes", ["Celeste", "Hades"]),
+    ("-fav:no drive:D", ["Dark Souls III"]),
+    ('path:"steam library"', ["Celeste"]),
+    ("-", None),
+])
+def test_negation(index, text, expected):
+    assert names(index, text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("fav:yes", ["Dark Souls III", "The Witcher 3"]),
+    ("fav:ON", ["Dark Souls III", "The Witcher 3"]),
+    ("fav:1 drive:C", ["The Witcher 3"]),
+    ("fav:no", ["Celeste", "Hades"]),
+    ("fav:off added:2024", ["Celeste", "Hades"]),
+    ("fav:false", ["Celeste", "Hades"]),
+])
+def test_favorites(index, text, expected):
+    assert names(index, text) == expected
+
+
+@pytest.mark.parametrize("word", ["fav:maybe", "fav:", "FAV:witcher"])
+def test_unknown_favorite_values_are_search_text(word):
+    assert all(field == "text" for field, _, _, _ in parse_library_query(word))
+
+
+def test_unknown_favorite_value_matches_as_text(index):
+    assert names(index, "fav:witcher") == []
+    assert names(index, "-fav:hades") == ["Celeste", "Dark Souls III", "The Witcher 3"]
+
+
+def app_with(index, text):
+    app = SteamManagerApp.__new__(SteamManagerApp)
+    app.library_items = index
+    app.library_filter_text = text
+    app.library_filter_cache = None
+    return app
+
+
+def test_favorite_toggle_keeps_unrelated_queries_cached(index):
+    app = app_with(index, "drive:D")
+    keys = app.library_matching_keys()
+    index.set_favorite(r"D:\Games\Hades\Hades.exe", True)
+    assert app.library_matching_keys() is keys
+
+
+def test_favorite_toggle_invalidates_favorite_queries(index):
+    app = app_with(index, "fav:yes")
+    before = app.library_matching_keys()
+    index.set_favorite(r"D:\Games\Hades\Hades.exe", True)
+    after = app.library_matching_keys()
+    assert len(after) == len(before) + 1
+
+
+def test_library_changes_invalidate_every_query(index):
+    app = app_with(index, "drive:D")
+    keys = app.library_matching_keys()
+    index.add(item(r"D:\Games\Celeste2\Celeste2.exe", "Celeste 2"))
+    assert len(app.library_matching_keys()) == len(keys) + 1
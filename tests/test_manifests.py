@@ -0,0 +1,12 @@
+from SteamManagerFINAL import find_app_manifests
+
+
+def test_find_app_manifests_ignores_backups_and_partial_writes(tmp_path):
+    for name in ("appmanifest_440.acf", "appmanifest_570.acf", "appmanifest_440.acf.bak",
+                 "appmanifest_570.acf.tmp", "appmanifest_x.acf", "libraryfolders.vdf"):
+        (tmp_path / name).write_text('"AppState" {}')
+    (tmp_path / "appmanifest_730.acf").mkdir()
+    assert sorted(find_app_manifests(str(tmp_path))) == [
+        ("440", str(tmp_path / "appmanifest_440.acf")),
+        ("570", str(tmp_path / "appmanifest_570.acf")),
+    ]
@@ -0,0 +1,240 @@
+import struct
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from SteamManagerFINAL import MIN_GAME_EXE_SIZE, PEError, PEFile, extract_pe_icon, non_game_reason
+
+RSRC_RVA = 0x1000
+RSRC_OFFSET = 0x400
+
+
+def resource_section(resources):
+    # {type id: {name id: data}} -> .rsrc bytes, one language per name.
+    types = sorted(resources)
+    leaves = [(t, n) for t in types for n in sorted(resources[t])]
+    offset = 16 + 8 * len(types)
+    type_dirs = {}
+    for t in types:
+        type_dirs[t] = offset
+        offset += 16 + 8 * len(resources[t])
+    lang_dirs = {}
+    for leaf in leaves:
+        lang_dirs[leaf] = offset
+        offset += 16 + 8
+    data_entries = {}
+    for leaf in leaves:
+        data_entries[leaf] = offset
+        offset += 16
+    data_offsets = {}
+    for leaf in leaves:
+        data_offsets[leaf] = offset
+        offset = (offset + len(resources[leaf[0]][leaf[1]]) + 3) & ~3
+
+    out = bytearray(offset)
+
+    def directory(at, entries):
+        struct.pack_into("<IIHHHH", out, at, 0, 0, 0, 0, 0, len(entries))
+        for i, (name, target, is_dir) in enumerate(entries):
+            struct.pack_into("<II", out, at + 16 + 8 * i, name, target | (0x80000000 if is_dir else 0))
+
+    directory(0, [(t, type_dirs[t], True) for t in types])
+    for t in types:
+        directory(type_dirs[t], [(n, lang_dirs[(t, n)], True) for n in sorted(resources[t])])
+    for leaf in leaves:
+        directory(lang_dirs[leaf], [(0x409, data_entries[leaf], False)])
+        data = resources[leaf[0]][leaf[1]]
+        struct.pack_into("<IIII", out, data_entries[leaf], RSRC_RVA + data_offsets[leaf], len(data), 0, 0)
+        out[data_offsets[leaf]:data_offsets[leaf] + len(data)] = data
+    return bytes(out)
+
+
+def build_pe(subsystem=PEFile.SUBSYSTEM_WINDOWS_GUI, dll=False, resources=None, size=MIN_GAME_EXE_SIZE * 2, magic=0x20B):
+    rsrc = resource_section(resources) if resources else b""
+    opt_size = 240
+    header = bytearray(RSRC_OFFSET)
+    header[:2] = b"MZ"
+    struct.pack_into("<I", header, 0x3C, 0x40)
+    nt = 0x40
+    header[nt:nt + 4] = b"PE\0\0"
+    struct.pack_into("<HHIIIHH", header, nt + 4, 0x8664, 1 if rsrc else 0, 0, 0, 0, opt_size, 0x2022 if dll else 0x22)
+    opt = nt + 24
+    struct.pack_into("<H", header, opt, magic)
+    struct.pack_into("<H", header, opt + 68, subsystem)
+    struct.pack_into("<I", header, opt + 108, 16)
+    if rsrc:
+        struct.pack_into("<II", header, opt + 112 + 16, RSRC_RVA, len(rsrc))
+        section = opt + opt_size
+        header[section:section + 8] = b".rsrc\0\0\0"
+        struct.pack_into("<IIII", header, section + 8, len(rsrc), RSRC_RVA, len(rsrc), RSRC_OFFSET)
+    data = bytes(header) + rsrc
+    return data + b"\0" * max(0, size - len(data))
+
+
+def version_block(key, value=b"", value_type=0, children=()):
+    body = bytearray(struct.pack("<HHH", 0, len(value) // 2 if value_type == 1 else len(value), value_type))
+    body += (key + "\0").encode("utf-16-le")
+    body += b"\0" * (-len(body) % 4)
+    body += value
+    body += b"\0" * (-len(body) % 4)
+    for child in children:
+        body += child
+        body += b"\0" * (-len(body) % 4)
+    struct.pack_into("<H", body, 0, len(body))
+    return bytes(body)
+
+
+def version_info(**strings):
+    entries = [version_block(name, (value + "\0").encode("utf-16-le"), 1) for name, value in strings.items()]
+    table = version_block("040904b0", value_type=1, children=entries)
+    return version_block("VS_VERSION_INFO", b"\0" * 52, 0, [version_block("StringFileInfo", value_type=1, children=[table])])
+
+
+def icon_resources(size=32):
+    png = BytesIO()
+    Image.new("RGBA", (size, size), (255, 0, 0, 255)).save(png, "PNG")
+    png = png.getvalue()
+    group = struct.pack("<HHH", 0, 1, 1) + struct.pack("<BBBBHHIH", size, size, 0, 0, 1, 32, len(png), 1)
+    return {PEFile.RT_GROUP_ICON: {1: group}, PEFile.RT_ICON: {1: png}}
+
+
+def write(tmp_path, data, name="game.exe"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_well_formed_gui_executable_looks_like_a_game(tmp_path):
+    assert non_game_reason(write(tmp_path, build_pe())) is None
+
+
+@pytest.mark.parametrize("data", [b"", b"MZ", b"ZM" + b"\0" * 100, b"MZ" + b"\0" * 62])
+def test_not_an_executable(tmp_path, data):
+    path = write(tmp_path, data)
+    with pytest.raises(PEError):
+        PEFile(path)
+    assert non_game_reason(path).startswith("not a readable executable")
+
+
+def test_pe_offset_past_end_of_file(tmp_path):
+    data = bytearray(build_pe())
+    struct.pack_into("<I", data, 0x3C, len(data) + 100)
+    with pytest.raises(PEError, match="signature"):
+        PEFile(write(tmp_path, bytes(data)))
+
+
+def test_truncated_pe_headers(tmp_path):
+    with pytest.raises(PEError, match="truncated"):
+        PEFile(write(tmp_path, build_pe()[:0x40 + 30]))
+
+
+def test_unknown_optional_header_magic(tmp_path):
+    with pytest.raises(PEError, match="magic"):
+        PEFile(write(tmp_path, build_pe(magic=0x1234)))
+
+
+@pytest.mark.parametrize("kwargs, reason", [
+    ({"dll": True}, "DLL"),
+    ({"subsystem": PEFile.SUBSYSTEM_WINDOWS_CUI}, "non-GUI subsystem 3"),
+    ({"size": 1024}, "too small"),
+])
+def test_header_based_rejections(tmp_path, kwargs, reason):
+    assert non_game_reason(write(tmp_path, build_pe(**kwargs))) == reason
+
+
+def test_version_strings_reject_installers(tmp_path):
+    path = write(tmp_path, build_pe(resources={PEFile.RT_VERSION: {1: version_info(ProductName="Game Installer")}}))
+    assert PEFile(path).version_strings()["ProductName"] == "Game Installer"
+    assert non_game_reason(path) == "version info mentions 'installer'"
+
+
+def test_truncated_version_resource_is_ignored(tmp_path):
+    blob = version_info(ProductName="Some Game")[:40]
+    path = write(tmp_path, build_pe(resources={PEFile.RT_VERSION: {1: blob}}))
+    assert PEFile(path).version_strings() == {}
+    assert non_game_reason(path) is None
+
+
+def test_resource_directory_outside_any_section(tmp_path):
+    data = bytearray(build_pe(resources=icon_resources()))
+    struct.pack_into("<I", data, 0x40 + 24 + 112 + 16, 0x90000)
+    pe = PEFile(write(tmp_path, bytes(data)))
+    with pytest.raises(PEError, match="not backed"):
+        pe.resources(PEFile.RT_ICON)
+
+
+def test_corrupt_resource_directory(tmp_path):
+    data = bytearray(build_pe(resources=icon_resources()))
+    struct.pack_into("<HH", data, RSRC_OFFSET + 12, 0, 0xFFFF)  # Far more entries than the section holds
+    with pytest.raises(PEError, match="corrupt"):
+        PEFile(write(tmp_path, bytes(data))).resources(PEFile.RT_ICON)
+
+
+def test_extract_icon(tmp_path):
+    icon = extract_pe_icon(write(tmp_path, build_pe(resources=icon_resources())))
+    assert icon.size == (120, 68)
+    assert icon.getpixel((60, 34)) == (255, 0, 0, 255)
+    assert icon.getpixel((0, 0))[3] == 0
+
+
+def test_icon_group_without_its_icon(tmp_path):
+    resources = icon_resources()
+    resources[PEFile.RT_ICON] = {2: resources[PEFile.RT_ICON][1]}
+    assert extract_pe_icon(write(tmp_path, build_pe(resources=resources))) is None
+
+
+def test_truncated_icon_group(tmp_path):
+    resources = icon_resources()
+    resources[PEFile.RT_GROUP_ICON][1] = resources[PEFile.RT_GROUP_ICON][1][:10]
+    with pytest.raises(PEError, match="icon group"):
+        extract_pe_icon(write(tmp_path, build_pe(resources=resources)))
+
+
+def png_icon(side, color):
+    png = BytesIO()
+    Image.new("RGBA", (side, side), color).save(png, "PNG")
+    return png.getvalue()
+
+
+def dib_icon(side, bgra):
+    # 32-bit BITMAPINFOHEADER icon: height covers the colour rows plus the AND mask.
+    header = struct.pack("<IiiHHIIiiII", 40, side, side * 2, 1, 32, 0, 0, 0, 0, 0, 0)
+    return header + bytes(bgra) * side * side + b"\0" * (((side + 31) // 32) * 4 * side)
+
+
+def icon_group(*entries):
+    # entries: (side, icon id, data)
+    group = struct.pack("<HHH", 0, 1, len(entries))
+    for side, icon_id, data in entries:
+        group += struct.pack("<BBBBHHIH", side % 256, side % 256, 0, 0, 1, 32, len(data), icon_id)
+    return group
+
+
+def test_extract_icon_picks_the_smallest_size_covering_the_target(tmp_path):
+    icons = {1: png_icon(32, (255, 0, 0, 255)), 2: png_icon(128, (0, 255, 0, 255)), 3: png_icon(256, (0, 0, 255, 255))}
+    group = icon_group((32, 1, icons[1]), (256, 3, icons[3]), (128, 2, icons[2]))
+    path = write(tmp_path, build_pe(resources={PEFile.RT_GROUP_ICON: {1: group}, PEFile.RT_ICON: icons}))
+    assert extract_pe_icon(path).getpixel((60, 34)) == (0, 255, 0, 255)
+    # Only smaller sizes available: the largest of them.
+    assert extract_pe_icon(path, size=(600, 300)).getpixel((300, 150)) == (0, 0, 255, 255)
+
+
+def test_extract_dib_icon(tmp_path):
+    data = dib_icon(16, (0, 0, 255, 255))  # BGRA red
+    resources = {PEFile.RT_GROUP_ICON: {1: icon_group((16, 1, data))}, PEFile.RT_ICON: {1: data}}
+    icon = extract_pe_icon(write(tmp_path, build_pe(resources=resources)), size=(32, 32))
+    assert icon.getpixel((16, 16)) == (255, 0, 0, 255)
+
+
+def test_executable_without_icons(tmp_path):
+    assert extract_pe_icon(write(tmp_path, build_pe())) is None
+    path = write(tmp_path, build_pe(resources={PEFile.RT_VERSION: {1: version_info(ProductName="Game")}}), "v.exe")
+    assert extract_pe_icon(path) is None
+
+
+def test_undecodable_icon_data(tmp_path):
+    data = b"\x89PNG\r\n\x1a\n" + b"\0" * 40
+    resources = {PEFile.RT_GROUP_ICON: {1: icon_group((32, 1, data))}, PEFile.RT_ICON: {1: data}}
+    with pytest.raises(OSError):
+        extract_pe_icon(write(tmp_path, build_pe(resources=resources)))
@@ -0,0 +1,83 @@
+import os
+import subprocess
+import time
+
+import pytest
+
+import SteamManagerFINAL
+from SteamManagerFINAL import SteamSupervisor
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="uses a shell script as the Steam stub")
+
+
+@pytest.fixture
+def steam_exe(tmp_path):
+    # Runs until SIGTERM and leaves no child behind.
+    exe = tmp_path / "Steam" / "steam.exe"
+    exe.parent.mkdir()
+    exe.write_text("#!/bin/sh\ntrap 'exit 0' TERM\nwhile :; do sleep 0.05; done\n")
+    exe.chmod(0o755)
+    return str(exe)
+
+
+@pytest.fixture
+def started():
+    processes = []
+    yield processes
+    for process in processes:
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def test_running_stopped_restarted(steam_exe, started):
+    changes = []
+    steam = SteamSupervisor(lambda: steam_exe, on_change=changes.append, interval=0.02, scan_interval=0.1)
+    assert not steam.refresh()
+    steam.start()
+
+    assert steam.launch()
+    assert steam.running and changes == [True]
+    assert not steam.launch()  # Already running
+
+    assert steam.terminate(timeout=5)
+    assert not steam.running and changes == [True, False]
+    assert not steam.terminate()
+
+    # Started outside the app: found by the periodic process list scan.
+    started.append(subprocess.Popen([steam_exe]))
+    wait_for(lambda: steam.running)
+    assert changes == [True, False, True]
+
+    # Stopped outside the app: noticed from the known PIDs alone.
+    started[0].terminate()
+    started[0].wait()
+    wait_for(lambda: not steam.running)
+    assert changes == [True, False, True, False]
+
+
+def test_stopped_steam_is_not_searched_for_on_every_poll(steam_exe, monkeypatch):
+    scans = []
+    real_process_ids = SteamManagerFINAL.process_ids
+    monkeypatch.setattr(SteamManagerFINAL, "process_ids", lambda target: scans.append(target) or real_process_ids(target))
+    steam = SteamSupervisor(lambda: steam_exe, interval=0.01, scan_interval=60)
+    steam.start()
+    target = SteamManagerFINAL.library_path_key(steam_exe)
+    wait_for(lambda: target in scans)
+    time.sleep(0.3)
+    assert scans.count(target) == 1 and not steam.running
+
+
+def test_nothing_is_polled_before_start(steam_exe, monkeypatch):
+    scans = []
+    monkeypatch.setattr(SteamManagerFINAL, "process_ids", lambda target: scans.append(target) or [])
+    SteamSupervisor(lambda: steam_exe, interval=0.01)
+    time.sleep(0.1)
+    assert SteamManagerFINAL.library_path_key(steam_exe) not in scans
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from SteamManagerFINAL import TaskExecutor
+
+
+@pytest.fixture
+def executor():
+    errors = []
+    executor = TaskExecutor(on_error=errors.append, workers=4)
+    executor.errors = errors
+    yield executor
+    executor.shutdown()
+
+
+def drain_until(executor, done, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not done():
+        assert time.monotonic() < deadline, "timed out waiting for callbacks"
+        executor.drain()
+        time.sleep(0.005)
+    executor.drain()
+
+
+def settle(executor, futures):
+    for future in futures:
+        try:
+            future.exception(timeout=5)
+        except Exception:
+            pass  # Cancelled
+    time.sleep(0.02)
+    executor.drain()
+
+
+def test_callbacks_run_on_the_draining_thread(executor):
+    seen = []
+    executor.submit(lambda: 42, on_done=lambda result: seen.append((result, threading.current_thread())))
+    drain_until(executor, lambda: seen)
+    assert seen == [(42, threading.current_thread())]
+
+
+def test_errors_go_to_the_task_handler_or_the_default(executor):
+    def fail():
+        raise ValueError("boom")
+
+    own = []
+    executor.submit(fail, on_error=own.append)
+    executor.submit(fail)
+    drain_until(executor, lambda: own and executor.errors)
+    assert [str(e) for e in own + executor.errors] == ["boom", "boom"]
+
+
+def test_newer_task_with_the_same_key_supersedes(executor):
+    release = threading.Event()
+    results = []
+    first = executor.submit(release.wait, 5, on_done=lambda _: results.append("first"), key="search")
+    second = executor.submit(lambda: "second", on_done=results.append, key="search")
+    other = executor.submit(lambda: "other", on_done=results.append, key="details")
+    drain_until(executor, lambda: len(results) == 2)
+    release.set()  # The superseded task finishes after all, but must not call back
+    settle(executor, [first, second, other])
+    assert sorted(results) == ["other", "second"]
+    assert executor._keys == {}
+
+
+def test_cancel_drops_queued_and_running_tasks(executor):
+    release = threading.Event()
+    results = []
+    running = [executor.submit(release.wait, 5, on_done=results.append) for _ in range(4)]
+    queued = executor.submit(lambda: "queued", on_done=results.append)
+    kept = executor.submit(lambda: "kept", on_done=results.append)
+    executor.cancel(running[0])
+    executor.cancel(queued)
+    assert queued.cancelled()
+    release.set()
+    settle(executor, running + [queued, kept])
+    assert sorted(results, key=str) == [True, True, True, "kept"]
+    assert not executor._pending
+
+
+def test_call_soon_runs_in_order_on_drain(executor):
+    calls = []
+    threads = [threading.Thread(target=executor.call_soon, args=(calls.append, i)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+        thread.join()
+    assert calls == []
+    executor.drain()
+    assert calls == [0, 1, 2]